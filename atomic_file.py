@@ -0,0 +1,30 @@
+"""
+Atomic file writes shared by every script that updates files in place.
+
+The data is written to a temporary file in the target's directory and then
+renamed over the target, so readers (and an interrupted run) only ever see
+the old or the new file, never a partial one. The temporary file is removed
+if the write fails.
+"""
+
+import os
+import tempfile
+
+
+def atomic_write(path, data):
+    """Atomically replace `path` with `data` (bytes, or text written as UTF-8)"""
+
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -0,0 +1,98 @@
+"""
+OpenAI Batch API submission for bulk page regeneration.
+
+Full refreshes do not need interactive latency. In batch mode every page
+request is serialized into a single JSONL file, uploaded, and submitted as
+one batch against `/v1/chat/completions`; the batch is then polled until it
+finishes and the results are matched back to their pages by `custom_id`.
+The Batch API has much higher throughput limits and a lower price per token
+than individual requests.
+"""
+
+import os
+import json
+import time
+from datetime import datetime, timezone
+
+BATCH_DIR = ".gen-batches"
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+DEFAULT_POLL_INTERVAL = 30.0
+
+# Batch statuses after which the batch will not change any more
+FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def write_batch_file(set_name, entries, build_request, directory=BATCH_DIR):
+    """Serialize one request per entry into a JSONL batch input file"""
+
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    path = os.path.join(directory, f"{set_name}-{stamp}.jsonl")
+
+    with open(path, "w", encoding="utf-8") as f:
+        for entry in entries:
+            line = {
+                "custom_id": entry['filename'],
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": build_request(entry),
+            }
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+    return path
+
+
+def submit_batch(client, path, set_name):
+    """Upload a batch input file and start the batch"""
+
+    with open(path, "rb") as f:
+        input_file = client.files.create(file=f, purpose="batch")
+
+    return client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=COMPLETION_WINDOW,
+        metadata={"set": set_name},
+    )
+
+
+def wait_for_batch(client, batch_id, poll_interval=DEFAULT_POLL_INTERVAL):
+    """Poll a batch until it reaches a final status"""
+
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        progress = f" ({counts.completed}/{counts.total})" if counts else ""
+        print(f"⏳ Batch {batch.id}: {batch.status}{progress}")
+
+        if batch.status in FINAL_STATUSES:
+            return batch
+
+        time.sleep(poll_interval)
+
+
+def read_batch_results(client, batch):
+    """Return `{custom_id: (content, error, usage)}` for a finished batch"""
+
+    results = {}
+
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+
+        for line in client.files.content(file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            body = response.get("body") or {}
+
+            if record.get("error") or response.get("status_code") != 200:
+                error = record.get("error") or body.get("error") or f"HTTP {response.get('status_code')}"
+                message = error.get("message", error) if isinstance(error, dict) else error
+                results[record["custom_id"]] = (None, message, None)
+            else:
+                results[record["custom_id"]] = (body["choices"][0]["message"]["content"], None, body.get("usage"))
+
+    return results
@@ -0,0 +1,250 @@
+"""
+Benchmark the page generation pipeline against the local stand-in server.
+
+Runs the real generation code paths (the "models" page set's requests and
+template, `create_category_index_pages` and the homepage region update) against an
+in-process mock OpenAI endpoint with a configurable latency distribution,
+sweeping the worker pool size. For each concurrency level it reports
+per-page latency percentiles, pages per minute, tokens per second and the
+estimated cost at OpenAI prices, and writes the results as JSON so runs can
+be compared over time.
+
+Usage:
+    python benchmark_generation.py --jobs 1,4,8,16 --latency 2 \\
+        --latency-distribution lognormal --output benchmark-results.json
+    python benchmark_generation.py --baseline benchmark-results.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import platform
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+import generation_engine
+import managed_regions
+import page_sets
+from mock_openai_server import start_server, LATENCY_DISTRIBUTIONS
+
+DEFAULT_JOBS = "1,2,4,8,16"
+DEFAULT_OUTPUT = "benchmark-results.json"
+
+# Relative slowdown tolerated before --baseline reports a regression
+DEFAULT_TOLERANCE = 0.2
+
+
+def percentile(values, pct):
+    """Return the linearly interpolated `pct` percentile of `values`"""
+
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def benchmark_entries(models, count):
+    """Return `count` model entries, cycling the registry with unique filenames"""
+
+    entries = []
+    for i in range(count):
+        model = dict(models[i % len(models)])
+        if i >= len(models):
+            model['filename'] = f"{i // len(models)}-{model['filename']}"
+        entries.append(model)
+    return entries
+
+
+def run_level(entries, topics, jobs, engine_args):
+    """Generate every entry with `jobs` workers and measure the run
+
+    Runs in the current directory, which should hold no earlier output: a
+    page identical to the one on disk would skip the write path.
+    """
+
+    generation_engine.configure_engine(engine_args)
+    models = page_sets.PAGE_SETS["models"]
+
+    # The engine reports every page; only the summary line per level is shown
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        generated_files, failures = generation_engine.generate_pages(
+            entries,
+            lambda entry: generation_engine.complete(models.build_request(entry)),
+            models.render,
+            jobs=jobs,
+        )
+        generation_seconds = time.perf_counter() - start
+
+    # Per-page wall time and token usage come from the engine's run metrics
+    metrics = generation_engine.run_metrics()
+    latencies = [metrics.pages[entry['filename']]["wall_seconds"] for entry in entries]
+    totals = metrics.totals()
+
+    index_start = time.perf_counter()
+    for filename, content in page_sets.create_category_index_pages(entries):
+        generation_engine.write_page(filename, content)
+    category_index_seconds = time.perf_counter() - index_start
+
+    index_start = time.perf_counter()
+    for filename, regions in page_sets.create_homepage_regions(topics).items():
+        managed_regions.update_regions(filename, regions, before=page_sets.REGION_ANCHORS.get(filename))
+    update_index_seconds = time.perf_counter() - index_start
+
+    return {
+        "jobs": jobs,
+        "pages": len(generated_files),
+        "failed": len(failures),
+        "wall_seconds": round(generation_seconds, 4),
+        "latency_seconds": {
+            "p50": round(percentile(latencies, 50), 4),
+            "p95": round(percentile(latencies, 95), 4),
+            "p99": round(percentile(latencies, 99), 4),
+            "max": round(max(latencies, default=0.0), 4),
+        },
+        "pages_per_minute": round(len(generated_files) / generation_seconds * 60, 2) if generation_seconds else 0.0,
+        "tokens_per_second": round((totals["prompt_tokens"] + totals["completion_tokens"]) / generation_seconds, 1) if generation_seconds else 0.0,
+        "prompt_tokens": totals["prompt_tokens"],
+        "cached_prompt_tokens": totals["cached_prompt_tokens"],
+        "completion_tokens": totals["completion_tokens"],
+        "retries": totals["retries"],
+        "estimated_cost_usd": round(totals["cost_usd"], 4),
+        "category_index_seconds": round(category_index_seconds, 4),
+        "update_index_seconds": round(update_index_seconds, 4),
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Return human-readable regressions against a previous results file"""
+
+    previous = {level["jobs"]: level for level in baseline.get("results", [])}
+    regressions = []
+
+    for level in results:
+        before = previous.get(level["jobs"])
+        if before is None:
+            continue
+        if level["pages_per_minute"] < before["pages_per_minute"] * (1 - tolerance):
+            regressions.append(
+                f"jobs={level['jobs']}: {level['pages_per_minute']} pages/min (was {before['pages_per_minute']})"
+            )
+        if level["latency_seconds"]["p95"] > before["latency_seconds"]["p95"] * (1 + tolerance):
+            regressions.append(
+                f"jobs={level['jobs']}: p95 {level['latency_seconds']['p95']}s (was {before['latency_seconds']['p95']}s)"
+            )
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark page generation against a local mock endpoint")
+    parser.add_argument("--jobs", default=DEFAULT_JOBS,
+                        help=f"comma-separated worker pool sizes to sweep (default: {DEFAULT_JOBS})")
+    parser.add_argument("--pages", type=int, default=0,
+                        help="number of model pages per run, cycling the registry (default: one per model)")
+    parser.add_argument("--latency", type=float, default=1.0,
+                        help="mean (or median, for lognormal) seconds per completion")
+    parser.add_argument("--latency-jitter", type=float, default=0.5,
+                        help="uniform +/- jitter in seconds, or the lognormal sigma")
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--completion-chars", type=int, default=8000,
+                        help="length of each mock completion in characters")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of requests answered with a 500")
+    parser.add_argument("--rpm", type=int, default=0, help="requests-per-minute budget (default: unlimited)")
+    parser.add_argument("--tpm", type=int, default=0, help="tokens-per-minute budget (default: unlimited)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help=f"JSON results file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--baseline", help="earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"relative slowdown tolerated against --baseline (default: {DEFAULT_TOLERANCE})")
+    args = parser.parse_args(argv)
+    registry = page_sets.load_registry()
+    args.pages = args.pages or len(registry["models"])
+
+    levels = [int(jobs) for jobs in args.jobs.split(",") if jobs.strip()]
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    config = {key: value for key, value in vars(args).items() if key not in ("output", "baseline", "tolerance")}
+
+    server, base_url = start_server(
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        latency_distribution=args.latency_distribution,
+        completion_chars=args.completion_chars,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    # The engine creates its client from the environment on first use
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["OPENAI_API_KEY"] = "benchmark"
+
+    engine_parser = argparse.ArgumentParser()
+    generation_engine.add_engine_arguments(engine_parser)
+
+    output = os.path.abspath(args.output)
+    original_dir = os.getcwd()
+    homepage = os.path.abspath("index.qmd")
+
+    print(f"🏁 Benchmarking {args.pages} pages against {base_url} "
+          f"({args.latency_distribution} latency, {args.latency}s)")
+
+    results = []
+    try:
+        for jobs in levels:
+            # A fresh directory per level, so every level writes every page
+            workdir = tempfile.mkdtemp(prefix="wildfire-bench-")
+            shutil.copy(homepage, workdir)
+            try:
+                os.chdir(workdir)
+                engine_args = engine_parser.parse_args(["--no-cache", "--rpm", str(args.rpm), "--tpm", str(args.tpm)])
+                entries = benchmark_entries(registry["models"], args.pages)
+                result = run_level(entries, registry["content"], jobs, engine_args)
+            finally:
+                os.chdir(original_dir)
+                shutil.rmtree(workdir, ignore_errors=True)
+            results.append(result)
+            print(f"  jobs={jobs:>3}  {result['pages_per_minute']:>8} pages/min  "
+                  f"p50 {result['latency_seconds']['p50']:.2f}s  p95 {result['latency_seconds']['p95']:.2f}s  "
+                  f"p99 {result['latency_seconds']['p99']:.2f}s  {result['tokens_per_second']:>8} tok/s  "
+                  f"${result['estimated_cost_usd']:.4f}")
+    finally:
+        server.shutdown()
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": config,
+        "results": results,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(f"📊 Results written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("⚠️ Regressions against baseline:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("✅ No regressions against baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
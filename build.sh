@@ -9,7 +9,15 @@ export PATH="/tmp/quarto-1.4.549/bin:$PATH"
 cd /opt/build/repo
 
 echo "Building site with Quarto..."
-quarto render --no-clean
+# Renders only the pages that changed since the build recorded in
+# .site-build.json; without a previous build this is a full render
+python3 render_site.py
+
+echo "Building search index..."
+python3 search_index.py
+
+echo "Precompressing assets..."
+python3 precompress.py
 
 echo "Build complete! Files in _site:"
 ls -la _site/
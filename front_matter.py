@@ -0,0 +1,234 @@
+"""
+Front matter of the directory's Quarto pages, and a persistent index of it.
+
+Pages written by the generators start with a flat YAML header of
+`key: value` lines (scalars, quoted strings and `[a, b]` lists). Only that
+header is read: scanning stops at the closing `---`, so the page body is
+never loaded.
+
+`FrontMatterIndex` keeps the front matter of every `.qmd` page in a JSON file
+together with each file's mtime, size and header hash. A refresh only re-reads
+pages whose mtime or size changed, so index pages, navigation, sitemaps and
+link checks can query titles, categories and dates site-wide without
+rescanning the tree.
+
+Usage:
+    python front_matter.py                      # list every page
+    python front_matter.py --category "Fuel Moisture Models"
+    python front_matter.py --field title --field date
+    python front_matter.py --json
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+
+from atomic_file import atomic_write
+
+FENCE = "---"
+
+INDEX_FILE = ".front-matter.json"
+
+# Directories that never hold source pages
+SKIP_DIRS = {"_site", "_freeze", ".quarto", "node_modules"}
+
+
+def parse_value(value):
+    """Parse a flat YAML scalar or inline list"""
+
+    value = value.strip()
+
+    if value.startswith("[") and value.endswith("]"):
+        return [parse_value(item) for item in value[1:-1].split(",") if item.strip()]
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    if value in ("true", "false"):
+        return value == "true"
+    return value
+
+
+def read_header(path):
+    """Return the lines of a page's front matter, without the fences"""
+
+    lines = []
+
+    with open(path, "r", encoding="utf-8") as f:
+        if f.readline().rstrip() != FENCE:
+            return lines
+
+        for line in f:
+            line = line.rstrip("\n")
+            if line.rstrip() == FENCE:
+                break
+            lines.append(line)
+
+    return lines
+
+
+def parse_header(lines):
+    """Parse front matter lines into a dict"""
+
+    front_matter = {}
+    for line in lines:
+        if ":" not in line or line.startswith((" ", "\t", "#")):
+            continue
+        key, value = line.split(":", 1)
+        front_matter[key.strip()] = parse_value(value)
+    return front_matter
+
+
+def read_front_matter(path):
+    """Return the front matter of a page as a dict (empty if it has none)"""
+
+    return parse_header(read_header(path))
+
+
+def read_body(path):
+    """Return a page's text after its front matter"""
+
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    if text.startswith(FENCE):
+        end = text.find(f"\n{FENCE}", len(FENCE))
+        if end != -1:
+            return text[end + len(FENCE) + 1:]
+    return text
+
+
+def find_pages(root="."):
+    """Yield the relative paths of every .qmd page under `root`"""
+
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in SKIP_DIRS and not name.startswith("."))
+        for name in sorted(filenames):
+            if name.endswith(".qmd"):
+                yield os.path.relpath(os.path.join(directory, name), root)
+
+
+class FrontMatterIndex:
+    """Persistent front matter of every page, keyed by relative path"""
+
+    def __init__(self, path=INDEX_FILE, root="."):
+        self.path = path
+        self.root = root
+        self.changed = False
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.records = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.records = {}
+
+    def refresh(self):
+        """Bring the index up to date with the pages on disk
+
+        Pages whose mtime and size are unchanged are not opened. Returns the
+        paths whose front matter was added, changed or removed.
+        """
+
+        updated = []
+        seen = set()
+
+        for page in find_pages(self.root):
+            seen.add(page)
+            try:
+                stat = os.stat(os.path.join(self.root, page))
+            except FileNotFoundError:
+                continue
+
+            record = self.records.get(page)
+            if record and record["mtime_ns"] == stat.st_mtime_ns and record["size"] == stat.st_size:
+                continue
+
+            header = read_header(os.path.join(self.root, page))
+            digest = hashlib.sha256("\n".join(header).encode("utf-8")).hexdigest()
+            if record is None or record["hash"] != digest:
+                updated.append(page)
+
+            self.records[page] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "hash": digest,
+                "front_matter": parse_header(header),
+            }
+            self.changed = True
+
+        for page in [page for page in self.records if page not in seen]:
+            del self.records[page]
+            updated.append(page)
+            self.changed = True
+
+        return updated
+
+    def get(self, page):
+        """Return the front matter of a page, or None if it is not indexed"""
+
+        record = self.records.get(os.path.normpath(page))
+        return record["front_matter"] if record else None
+
+    def query(self, **fields):
+        """Return `{path: front matter}` for pages matching every field
+
+        A field matches if it equals the value or, for list fields such as
+        `categories`, contains it.
+        """
+
+        matches = {}
+        for page, record in sorted(self.records.items()):
+            front_matter = record["front_matter"]
+            for field, value in fields.items():
+                actual = front_matter.get(field)
+                if actual != value and not (isinstance(actual, list) and value in actual):
+                    break
+            else:
+                matches[page] = front_matter
+        return matches
+
+    def save(self):
+        """Atomically write the index if anything changed"""
+
+        if not self.changed:
+            return
+
+        atomic_write(self.path, json.dumps(self.records, indent=1, sort_keys=True, ensure_ascii=False) + "\n")
+        self.changed = False
+
+
+def load_index(path=INDEX_FILE, root="."):
+    """Load the front matter index, refresh it and save any changes"""
+
+    index = FrontMatterIndex(path, root)
+    index.refresh()
+    index.save()
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the front matter of every page in the directory")
+    parser.add_argument("--category", help="only pages listing this category")
+    parser.add_argument("--field", action="append", default=[],
+                        help="front matter field to print (repeatable; default: title)")
+    parser.add_argument("--json", action="store_true", help="print the matching front matter as JSON")
+    parser.add_argument("--index", default=INDEX_FILE, help=f"index file (default: {INDEX_FILE})")
+    args = parser.parse_args(argv)
+
+    index = load_index(args.index)
+    pages = index.query(categories=args.category) if args.category else index.query()
+
+    if args.json:
+        json.dump(pages, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+
+    fields = args.field or ["title"]
+    for page, front_matter in pages.items():
+        values = " | ".join(str(front_matter.get(field, "")) for field in fields)
+        print(f"{page}: {values}")
+    print(f"📄 {len(pages)} of {len(index.records)} pages")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
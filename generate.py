@@ -0,0 +1,239 @@
+"""
+Generate wildfire directory pages from the registry.
+
+One entry point for every page set in `registry.json`:
+
+    python generate.py --set models
+    python generate.py --set topics --only fire-weather-indices,wui-modeling
+    python generate.py --set content --dry-run
+    python generate.py --set models --sections --jobs 10 --only farsite
+    python generate.py --indexes-only
+
+The OpenAI client is only imported once a request actually has to reach the
+API, so dry runs, index rebuilds and cached or replayed runs start without it.
+"""
+
+import sys
+import time
+import argparse
+
+from generation_engine import (
+    add_engine_arguments,
+    configure_engine,
+    check_api_key,
+    complete,
+    complete_sections,
+    generate_incremental,
+    report_metrics,
+    write_page,
+)
+from front_matter import load_index
+from link_graph import prune_links
+from managed_regions import update_regions
+from page_sets import (
+    PAGE_SETS,
+    load_registry,
+    select_entries,
+    existing_pages,
+    REGION_ANCHORS,
+)
+
+
+def write_indexes(page_set, entries):
+    """Rebuild a set's index pages from the registry and the pages on disk
+
+    Only pages that exist are listed, with the title from their front
+    matter, and links in the static index text to pages that do not exist
+    are pruned, so a page whose generation failed is never linked. Sets
+    with `index_regions` update their generated regions of existing pages,
+    such as the homepage, in place. No API call is made. Returns the index
+    filenames, whether or not they changed.
+    """
+
+    pages = existing_pages(entries)
+    titles = {filename: front_matter['title'] for filename, front_matter in pages.items() if 'title' in front_matter}
+    listed = [entry for entry in entries if entry['filename'] in pages]
+
+    index_pages = page_set.index_pages(listed, titles) if page_set.index_pages else []
+    index_regions = page_set.index_regions(listed, titles) if page_set.index_regions else {}
+    site_pages = set(load_index().records) | {filename for filename, _ in index_pages}
+
+    def prune(filename, content):
+        content, missing = prune_links(content, site_pages.__contains__)
+        if missing:
+            print(f"✂️ Dropped links to missing pages from {filename}: {', '.join(sorted(missing))}")
+        return content
+
+    written = []
+    for filename, content in index_pages:
+        if write_page(filename, prune(filename, content)):
+            print(f"✅ Created index: {filename}")
+        else:
+            print(f"⏭️ Index unchanged: {filename}")
+        written.append(filename)
+
+    for filename, regions in index_regions.items():
+        regions = {name: prune(filename, content) for name, content in regions.items()}
+        try:
+            changed = update_regions(filename, regions, before=REGION_ANCHORS.get(filename))
+        except (FileNotFoundError, ValueError) as e:
+            print(f"❌ Could not update {filename}: {e}")
+            continue
+        if changed:
+            print(f"✅ Updated generated regions in {filename}")
+        else:
+            print(f"⏭️ Generated regions unchanged: {filename}")
+        written.append(filename)
+
+    return written
+
+
+def rebuild_indexes(registry):
+    """Rebuild the index pages of every page set without generating pages"""
+
+    start = time.perf_counter()
+    written = []
+    for name, page_set in PAGE_SETS.items():
+        print(f"\n📑 Rebuilding {name} indexes...")
+        written += write_indexes(page_set, registry[name])
+
+    print(f"\n✨ Rebuilt {len(written)} index pages in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
+
+
+def finish_models(entries, generated_files, failed):
+    """Write the category index pages after generating model pages"""
+
+    print("\n📑 Generating category index pages...")
+    category_pages = write_indexes(PAGE_SETS["models"], entries)
+    generated_files += category_pages
+
+    print(f"\n✨ Content Generation Complete!")
+    print(f"📊 Summary:")
+    print(f"  - Successfully generated: {len(generated_files)} files")
+    print(f"  - Failed: {len(failed)} models")
+    print(f"  - Categories created: {len(category_pages)}")
+
+    print(f"\n💡 Next steps:")
+    print(f"  1. Review generated content")
+    print(f"  2. Commit and push to GitHub")
+    print(f"  3. Site will auto-deploy to Netlify")
+
+
+def finish_topics(entries, generated_files, failed):
+    """Write the essential topics index and navigation snippet"""
+
+    print("\n📑 Creating Essential Topics index page and navigation update...")
+    generated_files += [filename for filename in write_indexes(PAGE_SETS["topics"], entries) if filename.endswith(".qmd")]
+
+    print(f"\n✨ Content Generation Complete!")
+    print(f"📊 Summary:")
+    print(f"  - Successfully generated: {len(generated_files)} files")
+    print(f"  - Failed: {len(failed)} topics")
+
+    print(f"\n💡 Next steps:")
+    print(f"  1. Review generated content")
+    print(f"  2. Add navigation from nav-update.txt to index.qmd")
+    print(f"  3. Commit and push to GitHub")
+    print(f"  4. Site will auto-deploy to Netlify")
+
+
+def finish_content(entries, generated_files, failed):
+    """Link the research topic pages from the homepage"""
+
+    if not generated_files and not failed:
+        print("\n✨ All topic pages are up to date!")
+    elif generated_files:
+        print(f"\n✨ Successfully generated {len(generated_files)} pages!")
+        print("\nGenerated files:")
+        for file in generated_files:
+            print(f"  - {file}")
+
+        print("\n📋 Updating homepage links to the research topics...")
+        write_indexes(PAGE_SETS["content"], entries)
+    else:
+        print("\n⚠️ No files were generated. Check your OpenAI API key.")
+
+
+# Steps run after a set's pages are generated
+FINISHERS = {
+    "models": finish_models,
+    "topics": finish_topics,
+    "content": finish_content,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate wildfire directory pages from the registry")
+    parser.add_argument("--set", dest="page_set", choices=sorted(PAGE_SETS),
+                        help="registry set to generate")
+    parser.add_argument("--indexes-only", action="store_true",
+                        help="rebuild every index page from the registry and existing pages, without API calls")
+    add_engine_arguments(parser)
+    args = parser.parse_args(argv)
+
+    registry = load_registry()
+    if args.indexes_only:
+        return rebuild_indexes(registry)
+    if args.page_set is None:
+        parser.error("--set is required unless --indexes-only is given")
+
+    page_set = PAGE_SETS[args.page_set]
+    entries = registry[page_set.name]
+
+    if args.only:
+        try:
+            select_entries(entries, args.only)
+        except ValueError as e:
+            parser.error(f"--only: {e}")
+
+    if args.section:
+        # Unchanged pages are never planned, so the pages must be named
+        if not (args.only or args.all):
+            parser.error("--section needs --only PAGES or --all to choose the pages to regenerate")
+        args.sections = True
+        unknown = set(args.section) - {heading for heading, _ in page_set.sections()}
+        if unknown:
+            parser.error(f"--section: not a section of {page_set.name} pages: {', '.join(sorted(unknown))}")
+    if args.sections and (args.stream or args.batch):
+        parser.error("--sections cannot be combined with --stream or --batch")
+
+    configure_engine(args)
+
+    if args.sections:
+        def generate(entry):
+            return page_set.assemble_sections(complete_sections(page_set.build_section_requests(entry)))
+    else:
+        def generate(entry):
+            return complete(page_set.build_request(entry))
+
+    print(f"🔥 Generating {page_set.description}...")
+    print(f"📚 Checking {len(entries)} pages, up to {args.jobs} concurrent requests...")
+
+    if not check_api_key(args):
+        return 1
+
+    generated_files, failed, _ = generate_incremental(
+        page_set.name, entries,
+        generate,
+        page_set.render, page_set.template, args,
+        build_request=page_set.build_request,
+    )
+
+    if args.dry_run:
+        return 0
+
+    FINISHERS[page_set.name](entries, generated_files, failed)
+
+    if failed:
+        print(f"\n⚠️ Failed pages (can retry):")
+        for title in failed:
+            print(f"  - {title}")
+
+    report_metrics()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
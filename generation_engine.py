@@ -0,0 +1,704 @@
+"""
+Shared page generation engine for the wildfire directory generators.
+
+The generator scripts fan their OpenAI calls out over a bounded worker pool
+so a full run takes roughly as long as its slowest requests rather than the
+sum of every request's latency.
+"""
+
+import os
+import re
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from atomic_file import atomic_write
+from batch_mode import DEFAULT_POLL_INTERVAL, write_batch_file, submit_batch, wait_for_batch, read_batch_results
+from generation_manifest import (
+    load_manifest,
+    save_manifest,
+    plan_generation,
+    print_plan,
+    record_generated,
+)
+from rate_limiter import (
+    RateLimiter,
+    DEFAULT_RPM,
+    DEFAULT_TPM,
+    estimate_tokens,
+    is_rate_limited,
+    retry_after_seconds,
+)
+from generation_metrics import RunMetrics, METRICS_DIR, attributed_to, current_page
+from page_sets import select_entries
+from response_cache import ResponseCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from run_journal import RunJournal
+from retry_policy import DeadLetterQueue, DEFAULT_MAX_ATTEMPTS, DEAD_LETTER_FILE, backoff_delay, is_transient
+
+# Default number of concurrent API requests
+DEFAULT_JOBS = 4
+
+class FixtureNotFoundError(LookupError):
+    """Raised in replay mode when no recorded response matches a request"""
+
+
+# Placeholder rendered in place of the page body when streaming
+STREAM_MARKER = "\x00STREAMED-CONTENT\x00"
+
+# Results of a worker that writes its page itself (see `generate_pages`)
+PAGE_WRITTEN = "written"
+PAGE_UNCHANGED = "unchanged"
+
+# Generation dates stamped into every page; a page whose new text differs
+# from the file on disk only in these is left untouched
+VOLATILE_PATTERNS = re.compile(
+    r"^date: .*$"
+    r"|^\*Last updated: .*\*$"
+    r"|^\*\*Last Updated\*\*: .*$"
+    r"|(?<=AI-assisted research on )[A-Z][a-z]+ \d{1,2}, \d{4}(?=\.)",
+    re.MULTILINE,
+)
+
+# Completion cache, replay fixtures, rate limiter, retry budget and run
+# metrics shared by every worker; configured from the command line
+_cache = None
+_replay = None
+_limiter = None
+_max_attempts = DEFAULT_MAX_ATTEMPTS
+_metrics = RunMetrics()
+_metrics_path = None
+
+# Worker pool for the section requests of section-parallel pages, and the
+# sections whose cached completion is ignored
+_section_pool = None
+_refresh_sections = set()
+
+# OpenAI client, created on the first request that actually needs the API
+_client = None
+_client_lock = threading.Lock()
+
+
+def add_engine_arguments(parser):
+    """Add the shared generation options to a script's argument parser"""
+
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        metavar="N",
+        help=f"maximum number of concurrent API requests (default: {DEFAULT_JOBS})",
+    )
+    parser.add_argument(
+        "--replay",
+        nargs="?",
+        const=DEFAULT_CACHE_DIR,
+        metavar="DIR",
+        help=("serve every completion from recorded fixtures in DIR (default: the response "
+              "cache) and never call the API"),
+    )
+    parser.add_argument(
+        "--rpm",
+        type=int,
+        default=DEFAULT_RPM,
+        help=f"requests-per-minute budget, 0 for unlimited (default: {DEFAULT_RPM})",
+    )
+    parser.add_argument(
+        "--tpm",
+        type=int,
+        default=DEFAULT_TPM,
+        help=f"tokens-per-minute budget, 0 for unlimited (default: {DEFAULT_TPM})",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=DEFAULT_MAX_ATTEMPTS,
+        metavar="N",
+        help=f"attempts per request for transient API errors (default: {DEFAULT_MAX_ATTEMPTS})",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help=f"only regenerate the pages recorded in {DEAD_LETTER_FILE}",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="continue an interrupted run, skipping pages it already completed",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="stream completions straight into their page files as they are generated",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="submit all pending pages as one OpenAI Batch API job",
+    )
+    parser.add_argument(
+        "--batch-id",
+        help="with --batch, wait for an already submitted batch instead of creating one",
+    )
+    parser.add_argument(
+        "--batch-poll",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        metavar="SECONDS",
+        help=f"seconds between batch status checks (default: {DEFAULT_POLL_INTERVAL:g})",
+    )
+    parser.add_argument(
+        "--sections",
+        action="store_true",
+        help="generate every section of a page as its own concurrent request and join them in order",
+    )
+    parser.add_argument(
+        "--section",
+        action="append",
+        default=[],
+        metavar="HEADING",
+        help=("regenerate only this section of the --only (or --all) pages and reuse the others "
+              "from the cache (repeatable)"),
+    )
+    parser.add_argument(
+        "--only",
+        type=lambda value: [name.strip() for name in value.split(",") if name.strip()],
+        metavar="PAGES",
+        help="comma-separated pages to regenerate (e.g. farsite,wrf-fire), whatever their state",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="regenerate every page, not just new or changed ones",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="print the generation plan without calling the API",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="FILE",
+        help=(f"write run metrics as JSON to FILE and Prometheus text beside it "
+              f"(default: {METRICS_DIR}/<run-id>.metrics.json)"),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"directory for cached API responses (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        metavar="MB",
+        help="size limit of the response cache before old entries are evicted",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="neither read nor write the response cache",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="ignore cached responses but store the fresh ones",
+    )
+
+
+def configure_engine(args):
+    """Set up the shared engine state from parsed command line arguments"""
+
+    global _cache, _replay, _limiter, _max_attempts, _metrics, _metrics_path, _section_pool, _refresh_sections
+
+    _replay = ResponseCache(args.replay, max_bytes=sys.maxsize) if args.replay else None
+
+    if args.no_cache or args.replay:
+        _cache = None
+    else:
+        _cache = ResponseCache(
+            args.cache_dir,
+            max_bytes=args.cache_max_mb * 1024 * 1024,
+            read=not args.refresh,
+        )
+
+    if args.rpm or args.tpm:
+        _limiter = RateLimiter(rpm=args.rpm, tpm=args.tpm)
+    else:
+        _limiter = None
+
+    _max_attempts = max(1, args.max_attempts)
+    _metrics = RunMetrics()
+    _metrics_path = args.metrics
+
+    if _section_pool is not None:
+        _section_pool.shutdown()
+    _section_pool = ThreadPoolExecutor(max_workers=max(1, args.jobs)) if args.sections else None
+    _refresh_sections = set(args.section)
+
+
+def run_metrics():
+    """Return the metrics collected since the engine was configured"""
+
+    return _metrics
+
+
+def openai_client():
+    """Return the shared OpenAI client, importing `openai` on first use
+
+    Retries are handled by the engine. The placeholder key lets offline
+    modes run without one; `check_api_key` refuses to reach the real API
+    when OPENAI_API_KEY is missing.
+    """
+
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            from openai import OpenAI
+
+            _client = OpenAI(api_key=os.environ.get('OPENAI_API_KEY') or "offline", max_retries=0)
+        return _client
+
+
+def _with_retries(payload, request):
+    """Run `request()` for a payload under the rate limiter with retries
+
+    Transient errors are retried with exponential backoff and jitter (a 429
+    also pauses every worker for its Retry-After); permanent errors and
+    exhausted retries are raised to the caller.
+    """
+
+    page = current_page()
+
+    for attempt in range(1, _max_attempts + 1):
+        if _limiter is not None:
+            start = time.perf_counter()
+            _limiter.acquire(estimate_tokens(payload))
+            _metrics.record(page, queue_wait_seconds=time.perf_counter() - start)
+
+        _metrics.record(page, requests=1, retries=1 if attempt > 1 else 0)
+        try:
+            result = request()
+        except Exception as e:
+            if not is_transient(e) or attempt == _max_attempts:
+                raise
+            retry_after = retry_after_seconds(e)
+            if _limiter is not None and is_rate_limited(e):
+                _limiter.record_rate_limited(retry_after)
+            time.sleep(max(backoff_delay(attempt), retry_after or 0))
+            continue
+
+        if _limiter is not None:
+            _limiter.record_success()
+        return result
+
+
+def check_api_key(args):
+    """Return True if the run can proceed, printing an error if a key is missing
+
+    Dry runs, replays and runs against a local stand-in (`OPENAI_BASE_URL`)
+    do not need an OpenAI API key.
+    """
+
+    if args.dry_run or args.replay or os.environ.get('OPENAI_BASE_URL'):
+        return True
+    if os.environ.get('OPENAI_API_KEY'):
+        return True
+
+    print("❌ ERROR: OPENAI_API_KEY not found in environment variables!")
+    print("   (use --replay or a local OPENAI_BASE_URL to run without one)")
+    return False
+
+
+def complete(payload, refresh=False):
+    """Return the completion text for a chat request payload
+
+    Responses are served from the on-disk cache when possible; otherwise the
+    request is sent through the rate limiter and retry policy and the result
+    is cached for the next run. `refresh` skips the cache lookup. In replay
+    mode only recorded fixtures are used.
+    """
+
+    if _replay is not None:
+        content = _replay.get(payload)
+        if content is None:
+            raise FixtureNotFoundError(f"no recorded response in {_replay.directory}")
+        _metrics.record(current_page(), cache_hits=1)
+        return content
+
+    if _cache is not None and not refresh:
+        content = _cache.get(payload)
+        if content is not None:
+            _metrics.record(current_page(), cache_hits=1)
+            return content
+
+    response = _with_retries(payload, lambda: openai_client().chat.completions.create(**payload))
+    content = response.choices[0].message.content
+    _metrics.record_usage(current_page(), payload.get("model"), response.usage)
+
+    if _cache is not None and content:
+        _cache.put(payload, content)
+
+    return content
+
+
+def complete_sections(requests):
+    """Complete `[(heading, payload)]` concurrently on the section pool
+
+    Every section is its own cached request, so a page takes about as long
+    as its slowest section and `--section HEADING` regenerates one section
+    while the others come from the cache. Returns `[(heading, text)]` in
+    the order of `requests`; raises if any section fails or comes back empty.
+    """
+
+    page = current_page()
+
+    def run(heading, payload):
+        with attributed_to(page):
+            content = complete(payload, refresh=heading in _refresh_sections)
+        if not content:
+            raise ValueError(f"empty completion for section '{heading}'")
+        return content
+
+    futures = [_section_pool.submit(run, heading, payload) for heading, payload in requests]
+    return [(heading, future.result()) for (heading, _), future in zip(requests, futures)]
+
+
+def stream_page(payload, entry, render):
+    """Stream a completion straight into its page file
+
+    The page template is rendered around a marker so the front matter is on
+    disk before the first token arrives. Body chunks are appended to
+    `<filename>.partial` as they stream in, and the finished page is renamed
+    into place atomically; a stalled generation leaves the partial file for
+    inspection. Token usage is requested in the final stream chunk. Only
+    when the response cache is enabled are the chunks also collected in
+    memory, to be stored for the next run. Returns PAGE_WRITTEN, or
+    PAGE_UNCHANGED if the page on disk already held the same text apart from
+    its dates, or None if the completion was empty.
+    """
+
+    filename = entry['filename']
+    head, tail = render(entry, STREAM_MARKER).split(STREAM_MARKER)
+
+    if _cache is not None:
+        content = _cache.get(payload)
+        if content is not None:
+            _metrics.record(filename, cache_hits=1)
+            return PAGE_WRITTEN if write_page(filename, head + content + tail) else PAGE_UNCHANGED
+
+    partial = f"{filename}.partial"
+    chunks = [] if _cache is not None else None
+
+    def stream():
+        written = 0
+        if chunks is not None:
+            chunks.clear()
+
+        with open(partial, 'w', encoding='utf-8') as f:
+            f.write(head)
+            f.flush()
+            stream = openai_client().chat.completions.create(
+                **payload, stream=True, stream_options={"include_usage": True}
+            )
+            for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    _metrics.record_usage(filename, payload.get("model"), chunk.usage)
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                f.write(delta)
+                f.flush()
+                written += len(delta)
+                if chunks is not None:
+                    chunks.append(delta)
+            f.write(tail)
+
+        return written
+
+    if not _with_retries(payload, stream):
+        os.remove(partial)
+        return None
+
+    if chunks:
+        _cache.put(payload, "".join(chunks))
+
+    with open(partial, 'r', encoding='utf-8') as f:
+        if is_unchanged(filename, f.read()):
+            os.remove(partial)
+            return PAGE_UNCHANGED
+
+    os.replace(partial, filename)
+    _metrics.record_write(filename, os.path.getsize(filename))
+    return PAGE_WRITTEN
+
+
+def is_unchanged(filename, content):
+    """Return True if a file already holds `content` apart from its dates"""
+
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            current = f.read()
+    except FileNotFoundError:
+        return False
+
+    if current == content:
+        return True
+    return VOLATILE_PATTERNS.sub("", current) == VOLATILE_PATTERNS.sub("", content)
+
+
+def write_page(filename, content):
+    """Atomically write a generated page to disk
+
+    A page that only differs from the file on disk in its generation dates
+    is not rewritten, so its mtime, git status and Quarto freeze state stay
+    as they are. Returns True if the file was written.
+    """
+
+    if is_unchanged(filename, content):
+        return False
+
+    data = content.encode('utf-8')
+    atomic_write(filename, data)
+    _metrics.record_write(filename, len(data))
+    return True
+
+
+def _finish_page(entry, render, content, error, progress, on_page):
+    """Write one generated page, report it, and return the failure (if any)
+
+    With no `render` the page was already written by the worker and
+    `content` is PAGE_WRITTEN or PAGE_UNCHANGED.
+    """
+
+    if content:
+        if render is not None:
+            written = write_page(entry['filename'], render(entry, content))
+        else:
+            written = content != PAGE_UNCHANGED
+        if on_page is not None:
+            on_page(entry)
+        if written:
+            print(f"[{progress}] ✅ Successfully created: {entry['filename']}")
+        else:
+            print(f"[{progress}] ⏭️ Unchanged apart from dates: {entry['filename']}")
+        return None
+
+    if error is not None:
+        print(f"Error generating content for {entry['title']}: {str(error)}")
+    print(f"[{progress}] ❌ Failed to generate: {entry['title']}")
+    return error or "empty completion"
+
+
+def generate_pages(entries, generate, render, jobs=DEFAULT_JOBS, on_page=None):
+    """Generate and write one page per entry using up to `jobs` workers
+
+    `generate(entry)` returns the page body and `render(entry, content)`
+    builds the final .qmd text. Each page is written as soon as its content
+    arrives and `on_page(entry)` is then called from the calling thread. If
+    `render` is None, `generate(entry)` writes the page itself and returns
+    PAGE_WRITTEN or PAGE_UNCHANGED on success.
+    The returned list of generated filenames and list of `(entry, error)`
+    failures always follow the order of `entries`, so summaries and index
+    pages never depend on which call finished first.
+    """
+
+    total = len(entries)
+    errors = [None] * total
+
+    def run(entry, queued_at):
+        with _metrics.track(entry, queued_at):
+            return generate(entry)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = {executor.submit(run, entry, time.perf_counter()): i for i, entry in enumerate(entries)}
+
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+
+            try:
+                content, error = future.result(), None
+            except Exception as e:
+                content, error = None, e
+
+            errors[i] = _finish_page(entries[i], render, content, error, f"{done}/{total}", on_page)
+
+    generated_files = [entry['filename'] for entry, error in zip(entries, errors) if error is None]
+    failures = [(entry, error) for entry, error in zip(entries, errors) if error is not None]
+
+    return generated_files, failures
+
+
+def generate_pages_batch(set_name, entries, build_request, render, args, on_page=None):
+    """Generate pages through the OpenAI Batch API instead of live requests
+
+    Cached completions are used directly; every other request goes into a
+    single batch that is submitted (or re-attached with `--batch-id`) and
+    polled until it finishes. Results are written in entry order and
+    returned in the same shape as `generate_pages`.
+    """
+
+    payloads = {entry['filename']: build_request(entry) for entry in entries}
+    results = {}
+
+    for entry in entries:
+        _metrics.add_page(entry)
+
+    if _cache is not None:
+        for entry in entries:
+            content = _cache.get(payloads[entry['filename']])
+            if content is not None:
+                _metrics.record(entry['filename'], cache_hits=1)
+                results[entry['filename']] = (content, None)
+
+    remaining = [entry for entry in entries if entry['filename'] not in results]
+    if remaining:
+        if args.batch_id:
+            batch_id = args.batch_id
+            print(f"📦 Re-attaching to batch {batch_id}")
+        else:
+            path = write_batch_file(set_name, remaining, build_request)
+            batch_id = submit_batch(openai_client(), path, set_name).id
+            print(f"📦 Submitted batch {batch_id} with {len(remaining)} requests from {path}")
+            print(f"   (if this run stops, re-attach with --batch --batch-id {batch_id})")
+
+        batch = wait_for_batch(openai_client(), batch_id, poll_interval=args.batch_poll)
+        batch_results = read_batch_results(openai_client(), batch)
+
+        for entry in remaining:
+            missing = (None, f"batch {batch.status} without a result for this page", None)
+            content, error, usage = batch_results.get(entry['filename'], missing)
+            _metrics.record(entry['filename'], requests=1)
+            _metrics.record_usage(entry['filename'], payloads[entry['filename']].get("model"), usage)
+            if content and _cache is not None:
+                _cache.put(payloads[entry['filename']], content)
+            results[entry['filename']] = (content, error)
+
+    total = len(entries)
+    errors = [
+        _finish_page(entry, render, *results[entry['filename']], f"{done}/{total}", on_page)
+        for done, entry in enumerate(entries, 1)
+    ]
+
+    generated_files = [entry['filename'] for entry, error in zip(entries, errors) if error is None]
+    failures = [(entry, error) for entry, error in zip(entries, errors) if error is not None]
+
+    return generated_files, failures
+
+
+def generate_incremental(set_name, entries, generate, render, template, args, build_request=None):
+    """Generate only the pages of a registry set whose inputs changed
+
+    The plan is printed before any API call is made. Successfully generated
+    pages are recorded in the manifest; failed ones stay pending for the next
+    run and are added to the dead-letter file, which `--retry-failed`
+    replays on its own. Every completed page is checkpointed in the manifest
+    and the run journal as it is written, so `--resume <run-id>` can pick up
+    an interrupted run. With `--batch` the pending pages are generated
+    through the Batch API, and with `--stream` each completion is streamed
+    into its page file; both send `build_request(entry)` payloads. `--only`
+    regenerates the named pages regardless of the plan. Returns the
+    generated filenames, failed titles and the plan.
+    """
+
+    manifest = load_manifest()
+    plan = plan_generation(manifest, set_name, entries, template)
+    print_plan(plan)
+
+    dead_letter = DeadLetterQueue()
+    journal = None
+
+    if args.resume:
+        try:
+            journal = RunJournal.load(args.resume)
+        except FileNotFoundError:
+            print(f"❌ No journal found for run {args.resume}")
+            return [], [], plan
+        if journal.set_name != set_name:
+            print(f"❌ Run {args.resume} generated '{journal.set_name}' pages, not '{set_name}'")
+            return [], [], plan
+
+        remaining = set(journal.remaining)
+        pending = [entry for entry in entries if entry['filename'] in remaining]
+        print(f"⏯️ Resuming run {journal.run_id}: {len(journal.completed)} pages done, {len(pending)} remaining")
+
+        # Pages finished before the interruption may not have reached the manifest
+        record_generated(manifest, set_name, [entry for entry in entries if entry['filename'] in journal.completed], template)
+        save_manifest(manifest)
+    elif args.retry_failed:
+        queued = dead_letter.pending(set_name)
+        pending = [entry for entry in entries if entry['filename'] in queued]
+        print(f"🔁 Replaying {len(pending)} failed pages from {DEAD_LETTER_FILE}")
+    elif args.only:
+        pending = select_entries(entries, args.only)
+    elif args.all:
+        pending = list(entries)
+    else:
+        stale = {entry['filename'] for entry in plan["new"] + plan["changed"]}
+        pending = [entry for entry in entries if entry['filename'] in stale]
+
+    if args.dry_run or not pending:
+        return [], [], plan
+
+    if journal is None:
+        journal = RunJournal.start(set_name, [entry['filename'] for entry in pending])
+    print(f"🧾 Run id: {journal.run_id} (continue an interrupted run with --resume {journal.run_id})")
+    _metrics.run_id = journal.run_id
+    _metrics.set_name = set_name
+
+    def checkpoint(entry):
+        journal.record_completed(entry['filename'])
+        record_generated(manifest, set_name, [entry], template)
+        save_manifest(manifest)
+
+    if args.batch and _replay is None:
+        generated_files, failures = generate_pages_batch(
+            set_name, pending, build_request, render, args, on_page=checkpoint
+        )
+    elif args.stream and _replay is None:
+        def stream(entry):
+            return stream_page(build_request(entry), entry, render)
+
+        generated_files, failures = generate_pages(pending, stream, None, jobs=args.jobs, on_page=checkpoint)
+    else:
+        generated_files, failures = generate_pages(pending, generate, render, jobs=args.jobs, on_page=checkpoint)
+    journal.finish()
+
+    generated = set(generated_files)
+    for entry in pending:
+        if entry['filename'] in generated:
+            dead_letter.record_success(set_name, entry)
+    for entry, error in failures:
+        dead_letter.record_failure(set_name, entry, error)
+    dead_letter.save()
+
+    if failures:
+        print(f"\n💀 {len(failures)} failed pages saved to {DEAD_LETTER_FILE} (rerun with --retry-failed)")
+
+    return generated_files, [entry['title'] for entry, _ in failures], plan
+
+
+def report_metrics():
+    """Write the run metrics and print the run's cost and token summary
+
+    Called by the generator scripts once every page and index is written.
+    Returns the metrics file path, or None if no generation run started.
+    """
+
+    if _metrics.run_id is None:
+        return None
+
+    path = _metrics_path or os.path.join(METRICS_DIR, f"{_metrics.run_id}.metrics.json")
+    _metrics.write(path)
+
+    totals = _metrics.totals()
+    print(f"\n💰 OpenAI API cost this run: ${totals['cost_usd']:.4f} "
+          f"({totals['prompt_tokens']} prompt + {totals['completion_tokens']} completion tokens, "
+          f"{totals['requests']} requests, {totals['retries']} retries, {totals['cache_hits']} cache hits)")
+    if totals['prompt_tokens']:
+        print(f"🗄️ Prompt cache: {totals['cached_prompt_tokens']} of {totals['prompt_tokens']} prompt tokens cached "
+              f"({100.0 * totals['cached_prompt_tokens'] / totals['prompt_tokens']:.0f}%), "
+              f"{totals['prompt_tokens'] - totals['cached_prompt_tokens']} uncached")
+    print(f"📈 Metrics written to {path}")
+    return path
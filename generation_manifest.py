@@ -0,0 +1,102 @@
+"""
+Manifest of generated pages for incremental regeneration.
+
+The manifest records a fingerprint of each registry entry's inputs together
+with the prompt template used to generate it. A run compares the current
+entries against the manifest and only regenerates pages whose fingerprint is
+new or has changed.
+"""
+
+import os
+import json
+import hashlib
+
+from atomic_file import atomic_write
+
+MANIFEST_FILE = "generation-manifest.json"
+
+# Registry fields that feed the prompt and the page template
+FINGERPRINT_FIELDS = ("title", "category", "focus", "organization", "type", "description")
+
+
+def fingerprint(entry, template):
+    """Return the fingerprint of an entry's inputs and its prompt template"""
+
+    inputs = {
+        "fields": {field: entry.get(field) for field in FINGERPRINT_FIELDS},
+        "template": template,
+    }
+    canonical = json.dumps(inputs, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def load_manifest(path=MANIFEST_FILE):
+    """Load the manifest, returning an empty one if it does not exist yet"""
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(manifest, path=MANIFEST_FILE):
+    """Atomically write the manifest with stable key ordering"""
+
+    atomic_write(path, json.dumps(manifest, indent=2, sort_keys=True, ensure_ascii=False) + "\n")
+
+
+def plan_generation(manifest, set_name, entries, template):
+    """Classify entries as new, changed or unchanged and find orphaned pages
+
+    A page whose file is missing on disk is treated as new even if the
+    manifest knows about it. Orphaned pages are manifest records with no
+    matching registry entry; they are reported but never deleted.
+    """
+
+    recorded = manifest.get(set_name, {})
+    plan = {"new": [], "changed": [], "unchanged": [], "orphaned": []}
+
+    for entry in entries:
+        record = recorded.get(entry['filename'])
+        if record is None or not os.path.exists(entry['filename']):
+            plan["new"].append(entry)
+        elif record["fingerprint"] != fingerprint(entry, template):
+            plan["changed"].append(entry)
+        else:
+            plan["unchanged"].append(entry)
+
+    filenames = {entry['filename'] for entry in entries}
+    plan["orphaned"] = sorted(name for name in recorded if name not in filenames)
+
+    return plan
+
+
+def print_plan(plan):
+    """Print a summary of a generation plan"""
+
+    print("🗺️ Generation plan:")
+    for status in ("new", "changed", "unchanged"):
+        print(f"  - {status.capitalize()}: {len(plan[status])}")
+        if status != "unchanged":
+            for entry in plan[status]:
+                print(f"      {entry['filename']}")
+    print(f"  - Orphaned: {len(plan['orphaned'])}")
+    for filename in plan["orphaned"]:
+        print(f"      {filename}")
+
+
+def record_generated(manifest, set_name, entries, template):
+    """Record fresh fingerprints for successfully generated entries
+
+    Records for orphaned pages are kept while their file still exists so they
+    keep showing up in the plan until someone removes them.
+    """
+
+    recorded = manifest.setdefault(set_name, {})
+    for entry in entries:
+        recorded[entry['filename']] = {"fingerprint": fingerprint(entry, template)}
+
+    for filename in list(recorded):
+        if not os.path.exists(filename):
+            del recorded[filename]
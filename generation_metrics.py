@@ -0,0 +1,236 @@
+"""
+Per-page metrics for generation runs.
+
+Every completion call and every file write made by the generation engine is
+recorded against the page it belongs to: wall time, time spent queued for a
+worker or the rate limiter, retries, cache hits, the prompt (and cached
+prompt) and completion token counts reported in the API `usage` field, and
+bytes written. At the end of a run the figures are written as JSON and in
+the Prometheus text format, so cost and latency can be read per page and per
+category instead of estimated.
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from atomic_file import atomic_write
+
+# USD list prices per 1K (prompt, completion) tokens
+MODEL_PRICES = {
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+}
+DEFAULT_MODEL = "gpt-3.5-turbo"
+
+# Fraction of the prompt price billed for prompt tokens served from the
+# provider's prompt cache
+CACHED_PROMPT_DISCOUNT = 0.5
+
+METRIC_PREFIX = "wildfire_generation"
+
+# Default output directory; not committed (workflows upload it as an artifact)
+METRICS_DIR = ".gen-metrics"
+
+# Counters kept for every page; summed per category and for the whole run
+COUNTERS = (
+    "requests",
+    "retries",
+    "cache_hits",
+    "prompt_tokens",
+    "cached_prompt_tokens",
+    "completion_tokens",
+    "bytes_written",
+    "wall_seconds",
+    "queue_wait_seconds",
+    "cost_usd",
+)
+
+# Page the calling worker thread is generating
+_local = threading.local()
+
+
+def estimate_cost(prompt_tokens, completion_tokens, model=DEFAULT_MODEL, cached_tokens=0):
+    """Return the USD cost of a number of prompt and completion tokens
+
+    `cached_tokens` of the prompt tokens are billed at the cached rate.
+    """
+
+    prompt_price, completion_price = MODEL_PRICES.get(model, MODEL_PRICES[DEFAULT_MODEL])
+    billed_prompt = prompt_tokens - cached_tokens + cached_tokens * CACHED_PROMPT_DISCOUNT
+    return (billed_prompt / 1000.0) * prompt_price + (completion_tokens / 1000.0) * completion_price
+
+
+def current_page():
+    """Return the filename of the page the calling thread is working on"""
+
+    return getattr(_local, "page", None)
+
+
+@contextmanager
+def attributed_to(filename):
+    """Attribute calls made inside the block to a page without timing it
+
+    Used by helper threads that work on part of a page tracked elsewhere.
+    """
+
+    previous = current_page()
+    _local.page = filename
+    try:
+        yield
+    finally:
+        _local.page = previous
+
+
+class RunMetrics:
+    """Thread-safe counters for one generation run, keyed by page filename"""
+
+    def __init__(self):
+        self.run_id = None
+        self.set_name = None
+        self.started_at = time.time()
+        self.pages = {}
+        self._lock = threading.Lock()
+
+    def add_page(self, entry):
+        """Register a registry entry so its counters carry its category"""
+
+        with self._lock:
+            self._page(entry['filename'], entry.get('category', ''))
+
+    @contextmanager
+    def track(self, entry, queued_at=None):
+        """Attribute every call made inside the block to `entry`'s page
+
+        The time since `queued_at` (when the page was handed to the worker
+        pool) is counted as queue wait, the time inside the block as wall
+        time.
+        """
+
+        self.add_page(entry)
+        start = time.perf_counter()
+        if queued_at is not None:
+            self.record(entry['filename'], queue_wait_seconds=start - queued_at)
+
+        _local.page = entry['filename']
+        try:
+            yield
+        finally:
+            _local.page = None
+            self.record(entry['filename'], wall_seconds=time.perf_counter() - start)
+
+    def record(self, filename, **counts):
+        """Add `counts` to a page's counters; calls outside a page are ignored"""
+
+        if filename is None:
+            return
+
+        with self._lock:
+            page = self._page(filename)
+            for name, value in counts.items():
+                page[name] += value
+
+    def record_usage(self, filename, model, usage):
+        """Add the token counts and cost of one API response's `usage`
+
+        Prompt tokens served from the provider's prompt cache are read from
+        `usage.prompt_tokens_details.cached_tokens`.
+        """
+
+        if usage is None:
+            return
+
+        if isinstance(usage, dict):
+            prompt_tokens = usage.get("prompt_tokens") or 0
+            completion_tokens = usage.get("completion_tokens") or 0
+            cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+        else:
+            prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+            completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+            cached_tokens = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", 0) or 0
+
+        self.record(
+            filename,
+            prompt_tokens=prompt_tokens,
+            cached_prompt_tokens=cached_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=estimate_cost(prompt_tokens, completion_tokens, model, cached_tokens),
+        )
+
+    def record_write(self, filename, nbytes):
+        """Count bytes written to any file, generated page or index"""
+
+        self.record(os.path.basename(filename), bytes_written=nbytes)
+
+    def totals(self, category=None):
+        """Sum the counters of every page, or of the pages in one category"""
+
+        totals = dict.fromkeys(COUNTERS, 0)
+        with self._lock:
+            for page in self.pages.values():
+                if category is None or page["category"] == category:
+                    for name in COUNTERS:
+                        totals[name] += page[name]
+        return totals
+
+    def to_dict(self):
+        with self._lock:
+            pages = {filename: dict(page) for filename, page in sorted(self.pages.items())}
+        categories = sorted({page["category"] for page in pages.values() if page["category"]})
+
+        return {
+            "run_id": self.run_id,
+            "set": self.set_name,
+            "started_at": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(timespec="seconds"),
+            "duration_seconds": round(time.time() - self.started_at, 3),
+            "totals": self.totals(),
+            "categories": {category: self.totals(category) for category in categories},
+            "pages": pages,
+        }
+
+    def to_prometheus(self):
+        """Render the per-category counters in the Prometheus text format"""
+
+        report = self.to_dict()
+        run_labels = f'set="{report["set"] or ""}",run_id="{report["run_id"] or ""}"'
+        lines = [
+            f"# HELP {METRIC_PREFIX}_duration_seconds Wall time of the generation run",
+            f"# TYPE {METRIC_PREFIX}_duration_seconds gauge",
+            f"{METRIC_PREFIX}_duration_seconds{{{run_labels}}} {report['duration_seconds']}",
+        ]
+
+        # Whole-run totals carry no category label
+        groups = [(run_labels, report["totals"])]
+        for category, totals in report["categories"].items():
+            label = category.replace("\\", "\\\\").replace('"', '\\"')
+            groups.append((f'{run_labels},category="{label}"', totals))
+
+        for name in COUNTERS:
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name}_total counter")
+            for labels, totals in groups:
+                lines.append(f"{METRIC_PREFIX}_{name}_total{{{labels}}} {round(totals[name], 6)}")
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write the run metrics to `path` (JSON) and a `.prom` file beside it"""
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        for target, text in (
+            (path, json.dumps(self.to_dict(), indent=2, ensure_ascii=False) + "\n"),
+            (os.path.splitext(path)[0] + ".prom", self.to_prometheus()),
+        ):
+            atomic_write(target, text)
+
+    def _page(self, filename, category=None):
+        page = self.pages.get(filename)
+        if page is None:
+            page = self.pages[filename] = dict.fromkeys(COUNTERS, 0)
+            page["category"] = ""
+        if category:
+            page["category"] = category
+        return page
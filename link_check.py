@@ -0,0 +1,258 @@
+"""
+External link checker for the directory's pages.
+
+Extracts every http(s) URL from the `.qmd` pages, deduplicates them and
+checks them concurrently. Requests go through a small connection pool that
+keeps connections to each host alive between checks and limits how many
+requests a single host receives at once, so a page full of links to one
+institution does not hammer its server. `HEAD` is used where the server
+allows it, with a `GET` fallback, and redirects are followed.
+
+Results are cached in `.link-check.json`; a link that was reachable within
+the TTL is not checked again, while broken links are rechecked every run.
+
+Set `LINK_CHECK_BASE_URL` to send every request to a local stand-in (see
+`mock_link_server.py`) instead of the real hosts; the original host is still
+sent in the `Host` header and used for the per-host limits.
+
+Usage:
+    python link_check.py                     # check every page
+    python link_check.py --ttl-hours 0       # ignore cached results
+    python link_check.py farsite.qmd wfds.qmd
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import threading
+import http.client
+from contextlib import contextmanager
+from urllib.parse import urljoin, urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+from atomic_file import atomic_write
+from front_matter import find_pages
+
+CACHE_FILE = ".link-check.json"
+
+DEFAULT_JOBS = 16
+DEFAULT_PER_HOST = 2
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_TTL_HOURS = 7 * 24
+MAX_REDIRECTS = 5
+
+STAND_IN_ENV = "LINK_CHECK_BASE_URL"
+USER_AGENT = "wildfire-directory-link-check/1.0 (+https://wildfire-directory.netlify.app)"
+
+URL_PATTERN = re.compile(r"https?://[^\s<>()\[\]{}\"'`|\\]+")
+TRAILING_PUNCTUATION = ".,;:!?*"
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+# Servers that refuse HEAD but serve GET
+HEAD_REFUSED_STATUSES = {403, 405, 501}
+
+
+def extract_links(pages):
+    """Return `{url: [pages linking to it]}` for every external URL in `pages`"""
+
+    links = {}
+    for page in pages:
+        with open(page, "r", encoding="utf-8") as f:
+            text = f.read()
+        for url in URL_PATTERN.findall(text):
+            url = url.rstrip(TRAILING_PUNCTUATION)
+            pages_linking = links.setdefault(url, [])
+            if page not in pages_linking:
+                pages_linking.append(page)
+    return dict(sorted(links.items()))
+
+
+class ConnectionPool:
+    """Keep-alive HTTP connections per host with a per-host concurrency limit"""
+
+    def __init__(self, per_host=DEFAULT_PER_HOST, timeout=DEFAULT_TIMEOUT, stand_in=None):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.stand_in = urlsplit(stand_in) if stand_in else None
+        self._idle = {}
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def _limit(self, host):
+        with self._lock:
+            if host not in self._limits:
+                self._limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self._limits[host]
+
+    def _connect(self, scheme, host):
+        if self.stand_in is not None:
+            scheme, host = self.stand_in.scheme, self.stand_in.netloc
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, timeout=self.timeout)
+        return http.client.HTTPConnection(host, timeout=self.timeout)
+
+    @contextmanager
+    def connection(self, scheme, host):
+        """Borrow a connection to `host`, waiting while it is at its limit"""
+
+        key = (scheme, host)
+        with self._limit(host):
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                conn = idle.pop() if idle else None
+            if conn is None:
+                conn = self._connect(scheme, host)
+            try:
+                yield conn
+            except BaseException:
+                conn.close()
+                raise
+            with self._lock:
+                self._idle[key].append(conn)
+
+    def close(self):
+        with self._lock:
+            for connections in self._idle.values():
+                for conn in connections:
+                    conn.close()
+            self._idle.clear()
+
+
+def request_status(pool, method, url):
+    """Send one request; returns (status, Location header)"""
+
+    parts = urlsplit(url)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    headers = {"Host": parts.netloc, "User-Agent": USER_AGENT, "Accept": "*/*"}
+
+    with pool.connection(parts.scheme, parts.netloc) as conn:
+        conn.request(method, path, headers=headers)
+        response = conn.getresponse()
+        if method == "HEAD":
+            response.read()
+        else:
+            # The body is not needed; drop the connection instead of reading it
+            conn.close()
+        return response.status, response.getheader("Location")
+
+
+def check_url(pool, url):
+    """Check one URL, following redirects; returns its result record"""
+
+    record = {"status": None, "ok": False, "error": None, "checked_at": time.time()}
+    target = url
+
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            status, location = request_status(pool, "HEAD", target)
+            if status in HEAD_REFUSED_STATUSES:
+                status, location = request_status(pool, "GET", target)
+            if status in REDIRECT_STATUSES and location:
+                target = urljoin(target, location)
+                continue
+            break
+        else:
+            record["error"] = f"more than {MAX_REDIRECTS} redirects"
+            return record
+    except (OSError, http.client.HTTPException) as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+
+    record["status"] = status
+    record["ok"] = status < 400 or status == 429
+    if target != url:
+        record["final_url"] = target
+    return record
+
+
+def load_cache(path=CACHE_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_cache(cache, path=CACHE_FILE):
+    """Atomically write the link check results"""
+
+    atomic_write(path, json.dumps(cache, indent=1, sort_keys=True) + "\n")
+
+
+def is_fresh(record, ttl_seconds, now=None):
+    """Return True if a cached result can be reused without a new check"""
+
+    now = time.time() if now is None else now
+    return bool(record) and record.get("ok") and record.get("status") != 429 and now - record["checked_at"] < ttl_seconds
+
+
+def check_links(urls, cache, jobs=DEFAULT_JOBS, per_host=DEFAULT_PER_HOST, timeout=DEFAULT_TIMEOUT,
+                ttl_seconds=DEFAULT_TTL_HOURS * 3600, stand_in=None):
+    """Check every URL not freshly cached and update `cache` in place
+
+    Returns the number of URLs actually checked.
+    """
+
+    now = time.time()
+    pending = [url for url in urls if not is_fresh(cache.get(url), ttl_seconds, now)]
+    if not pending:
+        return 0
+
+    pool = ConnectionPool(per_host=per_host, timeout=timeout, stand_in=stand_in)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            for url, record in zip(pending, executor.map(lambda url: check_url(pool, url), pending)):
+                cache[url] = record
+    finally:
+        pool.close()
+    return len(pending)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the external links of every page")
+    parser.add_argument("pages", nargs="*", help="pages to check (default: every page)")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"concurrent requests in total (default: {DEFAULT_JOBS})")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST,
+                        help=f"concurrent requests to one host (default: {DEFAULT_PER_HOST})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"seconds per request (default: {DEFAULT_TIMEOUT:g})")
+    parser.add_argument("--ttl-hours", type=float, default=DEFAULT_TTL_HOURS,
+                        help=f"reuse reachable results younger than this (default: {DEFAULT_TTL_HOURS})")
+    parser.add_argument("--cache", default=CACHE_FILE, help=f"result cache file (default: {CACHE_FILE})")
+    args = parser.parse_args(argv)
+
+    pages = args.pages or list(find_pages())
+    links = extract_links(pages)
+    cache = load_cache(args.cache)
+
+    stand_in = os.environ.get(STAND_IN_ENV)
+    if stand_in:
+        print(f"🧪 Sending every request to {stand_in}")
+
+    start = time.perf_counter()
+    checked = check_links(
+        list(links), cache,
+        jobs=args.jobs, per_host=args.per_host, timeout=args.timeout,
+        ttl_seconds=args.ttl_hours * 3600, stand_in=stand_in,
+    )
+    save_cache(cache, args.cache)
+
+    broken = [url for url in links if not cache[url]["ok"]]
+    for url in broken:
+        record = cache[url]
+        print(f"❌ {record['status'] or record['error']}  {url}")
+        for page in links[url]:
+            print(f"      in {page}")
+
+    print(f"🔗 {len(links)} links on {len(pages)} pages: {checked} checked, {len(links) - checked} from cache, "
+          f"{len(broken)} broken ({time.perf_counter() - start:.1f}s)")
+    return 1 if broken else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Internal link graph of the directory site.
+
+Reads every page once, together with the navigation in `_quarto.yml` and
+the `nav-update.txt` snippet, and builds the adjacency of links between
+`.qmd` pages. From it the tool reports:
+
+- dangling links: links to pages that do not exist (for example a page whose
+  generation failed),
+- orphan pages: pages no other page or navigation entry links to, and
+- inbound link counts per page.
+
+`prune_links` is used by the index builders to drop links to pages that do
+not exist before an index is written.
+
+Usage:
+    python link_graph.py               # dangling links and orphans
+    python link_graph.py --inbound     # also list inbound link counts
+    python link_graph.py --json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+from front_matter import find_pages
+
+# Markdown links to other pages of the site
+LINK_PATTERN = re.compile(r"\]\(([^)\s#]+\.qmd)(?:#[^)\s]*)?\)")
+
+# Navigation entries in the Quarto configuration
+NAV_PATTERN = re.compile(r"""^\s*(?:-\s*)?href:\s*["']?([^"'\s#]+\.qmd)""", re.MULTILINE)
+
+# Files outside the pages that link to pages
+NAVIGATION_FILES = ("_quarto.yml", "nav-update.txt")
+
+# Entry points that need no inbound links
+ROOT_PAGES = {"index.qmd"}
+
+# A markdown list item: "- ", "* " or "1. "
+LIST_ITEM_PATTERN = re.compile(r"^\s*(?:[-*+]|\d+\.)\s")
+
+
+def page_links(path):
+    """Return the set of pages a page or navigation file links to, relative to the site root"""
+
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    pattern = NAV_PATTERN if path.endswith((".yml", ".yaml")) else LINK_PATTERN
+    base = os.path.dirname(path)
+    return {os.path.normpath(os.path.join(base, target)) for target in pattern.findall(text)}
+
+
+class LinkGraph:
+    """Links between the pages of the site"""
+
+    def __init__(self, pages, links):
+        self.pages = set(pages)
+        # {source: set of linked pages}; sources include navigation files
+        self.links = links
+        self.inbound = {page: set() for page in self.pages}
+        for source, targets in links.items():
+            for target in targets:
+                if target != source:
+                    self.inbound.setdefault(target, set()).add(source)
+
+    @classmethod
+    def build(cls, root="."):
+        """Read every page and navigation file under `root` once"""
+
+        pages = list(find_pages(root))
+        sources = pages + [name for name in NAVIGATION_FILES if os.path.exists(os.path.join(root, name))]
+        links = {source: page_links(os.path.join(root, source)) for source in sources}
+        return cls(pages, links)
+
+    def dangling(self):
+        """Return sorted `(source, target)` links whose target does not exist"""
+
+        return sorted(
+            (source, target)
+            for source, targets in self.links.items()
+            for target in targets
+            if target not in self.pages
+        )
+
+    def orphans(self):
+        """Return the pages nothing else links to"""
+
+        return sorted(page for page in self.pages if not self.inbound[page] and page not in ROOT_PAGES)
+
+    def inbound_counts(self):
+        """Return `{page: number of pages and navigation files linking to it}`"""
+
+        return {page: len(self.inbound[page]) for page in sorted(self.pages)}
+
+
+def prune_links(text, exists):
+    """Remove links to pages for which `exists(page)` is false
+
+    List items linking to a missing page are dropped; other links to a
+    missing page are replaced by their text. Returns the new text and the
+    missing pages that were linked.
+    """
+
+    missing = set()
+
+    def unlink(match):
+        missing.add(match.group(2))
+        return match.group(1)
+
+    lines = []
+    for line in text.splitlines(keepends=True):
+        targets = LINK_PATTERN.findall(line)
+        gone = [target for target in targets if not exists(target)]
+        if not gone:
+            lines.append(line)
+        elif LIST_ITEM_PATTERN.match(line) and len(gone) == len(targets):
+            missing.update(gone)
+        else:
+            pattern = re.compile(r"\[([^\]]*)\]\((" + "|".join(map(re.escape, gone)) + r")(?:#[^)\s]*)?\)")
+            lines.append(pattern.sub(unlink, line))
+
+    return "".join(lines), missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report dangling links, orphans and inbound links between pages")
+    parser.add_argument("--inbound", action="store_true", help="list the inbound link count of every page")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    graph = LinkGraph.build()
+    dangling = graph.dangling()
+    orphans = graph.orphans()
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        json.dump({
+            "dangling": [{"source": source, "target": target} for source, target in dangling],
+            "orphans": orphans,
+            "inbound": graph.inbound_counts(),
+        }, sys.stdout, indent=2)
+        print()
+        return 1 if dangling else 0
+
+    for source, target in dangling:
+        print(f"❌ {source} → {target} (missing)")
+    for page in orphans:
+        print(f"🏝️ Orphan: {page}")
+    if args.inbound:
+        for page, count in sorted(graph.inbound_counts().items(), key=lambda item: (-item[1], item[0])):
+            print(f"{count:>5}  {page}")
+
+    links = sum(len(targets) for targets in graph.links.values())
+    print(f"🕸️ {len(graph.pages)} pages, {links} internal links: {len(dangling)} dangling, "
+          f"{len(orphans)} orphans ({elapsed:.1f} ms)")
+    return 1 if dangling else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Generated regions inside hand-written pages.
+
+A managed region is delimited by HTML comment markers, which Quarto leaves
+out of the rendered page:
+
+    <!-- BEGIN GENERATED: ai-research-topics -->
+    ...generated markdown...
+    <!-- END GENERATED: ai-research-topics -->
+
+`update_regions` replaces the contents of any number of regions of a file
+in one pass over its text, leaving everything outside the markers as it is.
+A region that is not in the file yet is inserted before a given heading (or
+at the end). The file is written atomically, and only when its bytes change.
+"""
+
+import re
+
+from atomic_file import atomic_write
+
+BEGIN_MARKER = "<!-- BEGIN GENERATED: {name} -->"
+END_MARKER = "<!-- END GENERATED: {name} -->"
+
+REGION_PATTERN = re.compile(
+    r"^<!-- BEGIN GENERATED: (?P<name>[\w.-]+) -->\n(?P<body>.*?)^<!-- END GENERATED: (?P=name) -->\n?",
+    re.MULTILINE | re.DOTALL,
+)
+BEGIN_PATTERN = re.compile(r"^<!-- BEGIN GENERATED: ([\w.-]+) -->$", re.MULTILINE)
+END_PATTERN = re.compile(r"^<!-- END GENERATED: ([\w.-]+) -->$", re.MULTILINE)
+
+
+def render_region(name, content):
+    """Return a region with its markers"""
+
+    return "".join((
+        BEGIN_MARKER.format(name=name), "\n",
+        content.strip("\n"), "\n",
+        END_MARKER.format(name=name), "\n",
+    ))
+
+
+def splice_regions(text, regions, before=None):
+    """Return `text` with the contents of `regions` (`{name: content}`) replaced
+
+    Regions missing from the text are inserted before the first heading
+    containing `before`, or appended. Raises ValueError if a region's markers
+    are unbalanced, so a broken file is never spliced twice.
+    """
+
+    parts = []
+    position = 0
+    found = set()
+    for match in REGION_PATTERN.finditer(text):
+        name = match.group("name")
+        found.add(name)
+        if name in regions:
+            parts += [text[position:match.start()], render_region(name, regions[name])]
+            position = match.end()
+    parts.append(text[position:])
+    text = "".join(parts)
+
+    # Complete regions are spliced above; any marker left outside one is unbalanced
+    outside = REGION_PATTERN.sub("", text)
+    unbalanced = set(BEGIN_PATTERN.findall(outside))
+    if unbalanced:
+        raise ValueError(f"region markers without a matching end: {', '.join(sorted(unbalanced))}")
+    unbalanced = set(END_PATTERN.findall(outside))
+    if unbalanced:
+        raise ValueError(f"region markers without a matching begin: {', '.join(sorted(unbalanced))}")
+
+    missing = "".join(render_region(name, content) + "\n" for name, content in regions.items() if name not in found)
+    if not missing:
+        return text
+
+    anchor = re.search(rf"^#+ .*{re.escape(before)}", text, re.MULTILINE) if before else None
+    if anchor:
+        return text[:anchor.start()] + missing + text[anchor.start():]
+    return text.rstrip("\n") + "\n\n" + missing.rstrip("\n") + "\n"
+
+
+def write_if_changed(path, text):
+    """Atomically write `text` to `path` unless the file already holds it; returns True if written"""
+
+    data = text.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+
+    atomic_write(path, data)
+    return True
+
+
+def update_regions(path, regions, before=None):
+    """Replace the given regions of a file; returns True if the file changed"""
+
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    return write_if_changed(path, splice_regions(text, regions, before))
@@ -0,0 +1,155 @@
+"""
+Local stand-in for the websites linked from the directory, used to exercise
+`link_check.py` offline.
+
+Answers for any host named in the `Host` header:
+
+    /status/<code>        responds with that status code
+    /redirect/<path>      301 to /<path> on the same host
+    anything else         200, unless host + path is listed with --broken
+
+Hosts listed with `--no-head` answer HEAD with 405 to exercise the GET
+fallback. Responses are delayed by `--latency` seconds, and the highest
+number of requests each host saw at once is served as JSON at
+`/__stats` so per-host limits can be verified.
+
+Usage:
+    python mock_link_server.py --port 8766 --latency 0.2 --broken www.firelab.org/
+    LINK_CHECK_BASE_URL=http://127.0.0.1:8766 python link_check.py --ttl-hours 0
+"""
+
+import json
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+
+
+class LinkServerState:
+    """Configured failures plus the per-host request concurrency seen so far"""
+
+    def __init__(self, latency=0.0, broken=(), no_head=()):
+        self.latency = latency
+        self.broken = set(broken)
+        self.no_head = set(no_head)
+        self.active = {}
+        self.peak = {}
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def enter(self, host):
+        with self.lock:
+            self.requests += 1
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+
+    def leave(self, host):
+        with self.lock:
+            self.active[host] -= 1
+
+    def status(self, method, host, path):
+        """Return (status, Location header) for a request"""
+
+        if method == "HEAD" and host in self.no_head:
+            return 405, None
+        if path.startswith("/status/"):
+            return int(path.split("/")[2]), None
+        if path.startswith("/redirect/"):
+            return 301, path[len("/redirect"):]
+        if host + path in self.broken:
+            return 404, None
+        return 200, None
+
+
+class MockLinkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _respond(self, method):
+        host = self.headers.get("Host", "")
+        path = self.path.split("?")[0]
+
+        if path == "/__stats":
+            with self.state.lock:
+                body = json.dumps({"requests": self.state.requests, "peak_per_host": self.state.peak}).encode("utf-8")
+            status, location = 200, None
+        else:
+            self.state.enter(host)
+            try:
+                time.sleep(self.state.latency)
+                status, location = self.state.status(method, host, path)
+            finally:
+                self.state.leave(host)
+            body = f"{status} {host}{path}\n".encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        if location:
+            self.send_header("Location", location)
+        self.end_headers()
+        if method != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._respond("HEAD")
+
+    def do_GET(self):
+        self._respond("GET")
+
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False, **options):
+    """Create a stand-in server; port 0 picks a free port"""
+
+    server = ThreadingHTTPServer((host, port), MockLinkHandler)
+    server.daemon_threads = True
+    server.state = LinkServerState(**options)
+    server.verbose = verbose
+    return server
+
+
+def start_server(host=DEFAULT_HOST, port=0, **options):
+    """Run a stand-in server on a background thread and return it with its base URL"""
+
+    server = create_server(host, port, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the websites the pages link to")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each response")
+    parser.add_argument("--broken", action="append", default=[], metavar="HOST/PATH",
+                        help="answer this host and path with 404 (repeatable)")
+    parser.add_argument("--no-head", action="append", default=[], metavar="HOST",
+                        help="answer HEAD requests to this host with 405 (repeatable)")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    server = create_server(
+        args.host, args.port, verbose=args.verbose,
+        latency=args.latency, broken=args.broken, no_head=args.no_head,
+    )
+    print(f"🧪 Mock link server listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
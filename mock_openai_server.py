@@ -0,0 +1,489 @@
+"""
+Local stand-in for the OpenAI API used to exercise the generators offline.
+
+Implements the chat completion endpoint used by live generation and the file
+upload and batch endpoints used by `--batch` mode:
+
+    POST /v1/chat/completions       chat completion
+    POST /v1/files                  upload a batch input file
+    GET  /v1/files/{id}             file metadata
+    GET  /v1/files/{id}/content     file contents
+    POST /v1/batches                create a batch from an uploaded file
+    GET  /v1/batches/{id}           poll a batch
+
+Chat completions are delayed according to `--latency-distribution` (fixed,
+uniform within `--latency-jitter`, lognormal or exponential around
+`--latency`), can be padded to a realistic length with `--completion-chars`,
+and can be made to fail at configurable rates with 500s (`--error-rate`) or
+429s carrying a Retry-After header (`--rate-limit-rate`). Requests with
+`"stream": true` get server-sent event chunks spaced `--chunk-delay` seconds
+apart, plus a final usage chunk when `stream_options.include_usage` is set.
+Usage reports the longest previously seen prompt prefix as cached tokens
+(`--prompt-cache-min-tokens`), like the API's prompt caching.
+Responses come from recorded fixtures when `--fixtures DIR` holds one for the
+request (the response cache directory is a valid fixture directory) and are
+otherwise deterministic canned completions. Batches move from "validating"
+to "in_progress" to "completed" over `--batch-delay` seconds.
+
+Usage:
+    python mock_openai_server.py --port 8765 --latency 0.5 --error-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 \\
+        python generate.py --set models --all --no-cache
+"""
+
+import os
+import math
+import json
+import time
+import uuid
+import random
+import hashlib
+import argparse
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from response_cache import payload_key
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_BATCH_DELAY = 2.0
+DEFAULT_RETRY_AFTER = 1
+
+LATENCY_DISTRIBUTIONS = ("uniform", "fixed", "lognormal", "exponential")
+
+# Characters of content per streamed chunk
+STREAM_CHUNK_CHARS = 24
+
+# Request options that change how a completion is delivered, not what it is;
+# fixtures are keyed by the payload without them
+TRANSPORT_KEYS = ("stream", "stream_options")
+
+# Prompt prefix caching as the OpenAI API does it: prompts of at least this
+# many tokens have their longest previously seen prefix, in steps of
+# PROMPT_CACHE_INCREMENT tokens, reported as cached
+PROMPT_CACHE_MIN_TOKENS = 1024
+PROMPT_CACHE_INCREMENT = 128
+
+# The stand-in counts one token per four characters
+CHARS_PER_TOKEN = 4
+
+
+def prompt_text(body):
+    return "".join(message.get("content", "") for message in body.get("messages", []))
+
+
+def canned_content(body, length=0):
+    """Return deterministic markdown for a request body, padded to `length` characters"""
+
+    digest = hashlib.sha256(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    content = (
+        "## Overview\n\n"
+        f"Mock completion {digest} generated by the local stand-in server.\n\n"
+        "## Key Features and Capabilities\n\n"
+        "- Deterministic output for identical requests\n"
+        "- No network access or API key required\n"
+    )
+
+    filler = "Placeholder paragraph text standing in for generated research content. "
+    if len(content) < length:
+        content += "\n" + (filler * (length // len(filler) + 1))[:length - len(content) - 1]
+    return content
+
+
+def canned_completion(body, content=None, cached_tokens=0):
+    """Build a chat completion response for a request body"""
+
+    if content is None:
+        content = canned_content(body)
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+    prompt_tokens = len(prompt_text(body)) // CHARS_PER_TOKEN
+    completion_tokens = len(content) // CHARS_PER_TOKEN
+
+    return {
+        "id": f"chatcmpl-{digest}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-3.5-turbo"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        },
+    }
+
+
+class MockState:
+    """Server configuration plus the uploaded files and batches held in memory"""
+
+    def __init__(self, batch_delay=DEFAULT_BATCH_DELAY, latency=0.0, latency_jitter=0.0,
+                 error_rate=0.0, rate_limit_rate=0.0, fixtures=None, seed=None, chunk_delay=0.0,
+                 latency_distribution="uniform", completion_chars=0,
+                 prompt_cache_min_tokens=PROMPT_CACHE_MIN_TOKENS):
+        self.batch_delay = batch_delay
+        self.chunk_delay = chunk_delay
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.latency_distribution = latency_distribution
+        self.completion_chars = completion_chars
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.prompt_cache_min_tokens = prompt_cache_min_tokens
+        self.prompt_prefixes = set()
+        self.prompt_cache_lock = threading.Lock()
+        self.fixtures = fixtures
+        self.files = {}
+        self.batches = {}
+        self.lock = threading.Lock()
+        self.random = random.Random(seed)
+
+    def draw(self):
+        """Return a (latency, outcome) pair for one chat completion request"""
+
+        with self.lock:
+            delay = self.sample_latency()
+            roll = self.random.random()
+
+        if roll < self.rate_limit_rate:
+            return delay, "rate_limited"
+        if roll < self.rate_limit_rate + self.error_rate:
+            return delay, "error"
+        return delay, "ok"
+
+    def sample_latency(self):
+        """Draw one response latency from the configured distribution"""
+
+        if not self.latency:
+            return 0.0
+        if self.latency_distribution == "fixed":
+            return self.latency
+        if self.latency_distribution == "lognormal":
+            # --latency is the median; --latency-jitter is the shape (sigma)
+            return self.random.lognormvariate(math.log(self.latency), self.latency_jitter or 0.5)
+        if self.latency_distribution == "exponential":
+            return self.random.expovariate(1.0 / self.latency)
+        return max(0.0, self.latency + self.random.uniform(-self.latency_jitter, self.latency_jitter))
+
+    def cached_prompt_tokens(self, body):
+        """Return how many prompt tokens a request would be served from cache
+
+        Every prefix of the prompt is remembered for the following requests.
+        """
+
+        prompt = prompt_text(body)
+        tokens = len(prompt) // CHARS_PER_TOKEN
+        if tokens < self.prompt_cache_min_tokens:
+            return 0
+
+        cached = 0
+        with self.prompt_cache_lock:
+            for length in range(self.prompt_cache_min_tokens, tokens + 1, PROMPT_CACHE_INCREMENT):
+                prefix = hashlib.sha256(prompt[:length * CHARS_PER_TOKEN].encode("utf-8")).digest()
+                if prefix in self.prompt_prefixes:
+                    cached = length
+                self.prompt_prefixes.add(prefix)
+        return cached
+
+    def completion_content(self, body):
+        """Return the recorded fixture for a request, or a canned completion"""
+
+        if self.fixtures:
+            payload = {key: value for key, value in body.items() if key not in TRANSPORT_KEYS}
+            path = os.path.join(self.fixtures, f"{payload_key(payload)}.json")
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)["content"]
+            except (FileNotFoundError, KeyError, json.JSONDecodeError):
+                pass
+        return canned_content(body, self.completion_chars)
+
+    def add_file(self, filename, purpose, data):
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        self.files[file_id] = {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(data),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed",
+            "data": data,
+        }
+        return self.files[file_id]
+
+    def create_batch(self, request):
+        batch_id = f"batch_{uuid.uuid4().hex[:24]}"
+        lines = [line for line in self.files[request["input_file_id"]]["data"].decode("utf-8").splitlines() if line.strip()]
+        self.batches[batch_id] = {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": request["endpoint"],
+            "input_file_id": request["input_file_id"],
+            "completion_window": request["completion_window"],
+            "status": "validating",
+            "created_at": int(time.time()),
+            "output_file_id": None,
+            "error_file_id": None,
+            "metadata": request.get("metadata"),
+            "request_counts": {"total": len(lines), "completed": 0, "failed": 0},
+            "_started": time.monotonic(),
+        }
+        return self.batches[batch_id]
+
+    def advance_batch(self, batch):
+        """Move a batch along its lifecycle based on elapsed time"""
+
+        elapsed = time.monotonic() - batch["_started"]
+        if batch["status"] == "validating" and elapsed >= self.batch_delay / 2:
+            batch["status"] = "in_progress"
+        if batch["status"] == "in_progress" and elapsed >= self.batch_delay:
+            self.complete_batch(batch)
+
+    def complete_batch(self, batch):
+        output = []
+        for line in self.files[batch["input_file_id"]]["data"].decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            output.append(json.dumps({
+                "id": f"batch_req_{uuid.uuid4().hex[:24]}",
+                "custom_id": request["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "request_id": uuid.uuid4().hex,
+                    "body": canned_completion(
+                        request["body"],
+                        self.completion_content(request["body"]),
+                        self.cached_prompt_tokens(request["body"]),
+                    ),
+                },
+                "error": None,
+            }))
+
+        output_file = self.add_file(f"{batch['id']}_output.jsonl", "batch_output", ("\n".join(output) + "\n").encode("utf-8"))
+        batch["output_file_id"] = output_file["id"]
+        batch["request_counts"]["completed"] = len(output)
+        batch["status"] = "completed"
+        batch["completed_at"] = int(time.time())
+
+
+def _public(record):
+    return {key: value for key, value in record.items() if not key.startswith("_") and key != "data"}
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    """Routes the subset of the OpenAI REST API the generators use"""
+
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status, message, error_type="invalid_request_error"):
+        self._send(status, {"error": {"message": message, "type": error_type, "code": None}})
+
+    def do_GET(self):
+        parts = self.path.split("?")[0].strip("/").split("/")
+
+        with self.state.lock:
+            if parts[:2] == ["v1", "files"] and len(parts) in (3, 4):
+                record = self.state.files.get(parts[2])
+                if record is None:
+                    return self._error(404, f"No such file: {parts[2]}")
+                if len(parts) == 4 and parts[3] == "content":
+                    return self._send(200, record["data"], content_type="application/octet-stream")
+                return self._send(200, _public(record))
+
+            if parts[:2] == ["v1", "batches"] and len(parts) == 3:
+                batch = self.state.batches.get(parts[2])
+                if batch is None:
+                    return self._error(404, f"No such batch: {parts[2]}")
+                self.state.advance_batch(batch)
+                return self._send(200, _public(batch))
+
+        self._error(404, f"Unknown endpoint: GET {self.path}")
+
+    def do_POST(self):
+        path = self.path.split("?")[0].rstrip("/")
+        body = self._read_body()
+
+        if path == "/v1/chat/completions":
+            return self._chat_completion(json.loads(body or b"{}"))
+
+        if path == "/v1/files":
+            message = BytesParser(policy=HTTP).parsebytes(
+                b"Content-Type: " + self.headers["Content-Type"].encode("latin-1") + b"\r\n\r\n" + body
+            )
+            fields = {}
+            for part in message.iter_parts():
+                name = part.get_param("name", header="content-disposition")
+                fields[name] = (part.get_filename(), part.get_payload(decode=True))
+
+            filename, data = fields.get("file", (None, b""))
+            purpose = fields.get("purpose", (None, b"batch"))[1].decode("utf-8")
+            with self.state.lock:
+                record = self.state.add_file(filename or "upload.jsonl", purpose, data)
+            return self._send(200, _public(record))
+
+        if path == "/v1/batches":
+            request = json.loads(body or b"{}")
+            with self.state.lock:
+                if request.get("input_file_id") not in self.state.files:
+                    return self._error(400, "input_file_id does not exist")
+                batch = self.state.create_batch(request)
+                return self._send(200, _public(batch))
+
+        self._error(404, f"Unknown endpoint: POST {self.path}")
+
+
+    def _chat_completion(self, request):
+        delay, outcome = self.state.draw()
+        time.sleep(delay)
+
+        if outcome == "rate_limited":
+            return self._send(
+                429,
+                {"error": {"message": "Rate limit reached (mock)", "type": "requests", "code": "rate_limit_exceeded"}},
+                headers={"Retry-After": str(DEFAULT_RETRY_AFTER)},
+            )
+        if outcome == "error":
+            return self._error(500, "The server had an error processing your request (mock)", "server_error")
+
+        content = self.state.completion_content(request)
+        if request.get("stream"):
+            return self._stream_completion(request, content)
+        self._send(200, canned_completion(request, content, self.state.cached_prompt_tokens(request)))
+
+    def _stream_completion(self, request, content):
+        """Send a completion as chunked server-sent events"""
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        completion = canned_completion(request, content, self.state.cached_prompt_tokens(request))
+        base = {key: completion[key] for key in ("id", "created", "model")}
+        deltas = [{"role": "assistant", "content": ""}]
+        deltas += [{"content": content[i:i + STREAM_CHUNK_CHARS]} for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+
+        for i, delta in enumerate(deltas + [{}]):
+            chunk = dict(base, object="chat.completion.chunk", choices=[{
+                "index": 0,
+                "delta": delta,
+                "finish_reason": "stop" if i == len(deltas) else None,
+            }])
+            self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+            if i and self.state.chunk_delay:
+                time.sleep(self.state.chunk_delay)
+
+        if (request.get("stream_options") or {}).get("include_usage"):
+            usage_chunk = dict(base, object="chat.completion.chunk", choices=[], usage=completion["usage"])
+            self._write_chunk(f"data: {json.dumps(usage_chunk)}\n\n")
+
+        self._write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False, **options):
+    """Create a mock server; port 0 picks a free port"""
+
+    server = ThreadingHTTPServer((host, port), MockOpenAIHandler)
+    server.daemon_threads = True
+    server.state = MockState(**options)
+    server.verbose = verbose
+    return server
+
+
+def start_server(host=DEFAULT_HOST, port=0, **options):
+    """Run a mock server on a background thread and return it with its base URL"""
+
+    server = create_server(host, port, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenAI API")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--batch-delay", type=float, default=DEFAULT_BATCH_DELAY,
+                        help="seconds until a submitted batch completes")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="mean seconds before a chat completion is answered")
+    parser.add_argument("--latency-jitter", type=float, default=0.0,
+                        help="uniform +/- jitter in seconds, or the lognormal sigma")
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="uniform",
+                        help="shape of the response latency distribution (default: uniform)")
+    parser.add_argument("--completion-chars", type=int, default=0,
+                        help="pad canned completions to this many characters")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of chat completions answered with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0,
+                        help="fraction of chat completions answered with a 429")
+    parser.add_argument("--fixtures", metavar="DIR",
+                        help="directory of recorded responses (e.g. the .gen-cache directory)")
+    parser.add_argument("--chunk-delay", type=float, default=0.0,
+                        help="seconds between streamed chunks")
+    parser.add_argument("--prompt-cache-min-tokens", type=int, default=PROMPT_CACHE_MIN_TOKENS,
+                        help=f"shortest prompt whose prefix is reported as cached (default: {PROMPT_CACHE_MIN_TOKENS})")
+    parser.add_argument("--seed", type=int, help="seed for latency and error injection")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    server = create_server(
+        args.host, args.port, verbose=args.verbose,
+        batch_delay=args.batch_delay,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        latency_distribution=args.latency_distribution,
+        completion_chars=args.completion_chars,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        fixtures=args.fixtures,
+        seed=args.seed,
+        chunk_delay=args.chunk_delay,
+        prompt_cache_min_tokens=args.prompt_cache_min_tokens,
+    )
+    print(f"🧪 Mock OpenAI server listening on http://{args.host}:{server.server_address[1]}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Near-duplicate content detection across the directory's pages.
+
+Pages generated from overlapping prompts (a model page and a topic page on
+the same subject) tend to repeat long passages. Only the generated body of
+each registry page is compared: the text its page set's template renders
+around the completion (callout, related links, contributing footer) is the
+same on every page by design and is cut off first. Each body is split into
+sections at its headings, each section is turned into a set of word
+shingles, and a MinHash signature is computed for all sections at once with
+NumPy. Locality-sensitive hashing over signature bands groups likely matches
+into buckets, so only sections sharing a bucket are compared instead of
+every pair. Candidate pairs are confirmed with their exact shingle Jaccard
+similarity and reported per page pair above a threshold.
+
+Usage:
+    python near_duplicates.py                    # section pairs with similarity >= 0.5
+    python near_duplicates.py --threshold 0.3 --level page
+    python near_duplicates.py --json
+"""
+
+import re
+import sys
+import json
+import zlib
+import argparse
+from itertools import combinations
+
+import numpy as np
+
+from page_sets import PAGE_SETS, load_registry
+
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 128
+BANDS = 32
+DEFAULT_THRESHOLD = 0.5
+
+# Sections shorter than this many words are boilerplate (headings, link lists)
+MIN_WORDS = 40
+
+# Mersenne prime for the universal hash family; products stay below 2**64
+PRIME = (1 << 31) - 1
+SEED = 20240601
+
+HEADING_PATTERN = re.compile(r"^#{1,6}\s+(.*)$", re.MULTILINE)
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def split_sections(text):
+    """Return `[(heading, text), ...]` for a page body split at its headings"""
+
+    matches = list(HEADING_PATTERN.finditer(text))
+    sections = [("(introduction)", text[:matches[0].start() if matches else len(text)])]
+    for match, following in zip(matches, matches[1:] + [None]):
+        end = following.start() if following else len(text)
+        sections.append((match.group(1).strip(), text[match.end():end]))
+    return sections
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Return the hashed word shingles of a text as a uint64 array"""
+
+    words = WORD_PATTERN.findall(text.lower())
+    grams = {" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+    return np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.uint64, count=len(grams))
+
+
+def generated_bodies():
+    """Yield `(page, generated body)` for every registry page on disk"""
+
+    seen = set()
+    for set_name, entries in load_registry().items():
+        page_set = PAGE_SETS[set_name]
+        for entry in entries:
+            page = entry['filename']
+            if page in seen:
+                continue
+            seen.add(page)
+            try:
+                with open(page, "r", encoding="utf-8") as f:
+                    text = f.read()
+            except FileNotFoundError:
+                continue
+            body = page_set.generated_body(entry, text)
+            if body is None:
+                print(f"⚠️ Skipping {page}: does not match the {set_name} template", file=sys.stderr)
+                continue
+            yield page, body
+
+
+def collect_units(level="section", min_words=MIN_WORDS):
+    """Return the comparable units of every page as dicts with their shingles"""
+
+    units = []
+    for page, body in generated_bodies():
+        parts = [("(page)", body)] if level == "page" else split_sections(body)
+        for heading, text in parts:
+            words = len(WORD_PATTERN.findall(text.lower()))
+            if words >= min_words:
+                units.append({"page": page, "heading": heading, "words": words, "shingles": shingles(text)})
+    return units
+
+
+def minhash_signatures(shingle_sets, permutations=NUM_PERMUTATIONS, seed=SEED):
+    """Return a `(units, permutations)` matrix of MinHash values"""
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, PRIME, size=permutations, dtype=np.uint64)[:, None]
+    b = rng.integers(0, PRIME, size=permutations, dtype=np.uint64)[:, None]
+
+    signatures = np.empty((len(shingle_sets), permutations), dtype=np.uint64)
+    for row, values in enumerate(shingle_sets):
+        signatures[row] = ((a * (values[None, :] % PRIME) + b) % PRIME).min(axis=1)
+    return signatures
+
+
+def lsh_candidates(signatures, bands=BANDS):
+    """Return the index pairs that share at least one signature band"""
+
+    rows = signatures.shape[1] // bands
+    candidates = set()
+    for band in range(bands):
+        buckets = {}
+        chunk = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        for unit, key in enumerate(chunk):
+            buckets.setdefault(key.tobytes(), []).append(unit)
+        for members in buckets.values():
+            candidates.update(combinations(members, 2))
+    return candidates
+
+
+def jaccard(first, second):
+    """Exact Jaccard similarity of two shingle arrays"""
+
+    union = np.union1d(first, second).size
+    return np.intersect1d(first, second).size / union if union else 0.0
+
+
+def find_duplicates(units, threshold=DEFAULT_THRESHOLD, bands=BANDS, permutations=NUM_PERMUTATIONS):
+    """Return near-duplicate unit pairs of different pages, most similar first"""
+
+    if len(units) < 2:
+        return []
+
+    signatures = minhash_signatures([unit["shingles"] for unit in units], permutations)
+    duplicates = []
+    for i, j in lsh_candidates(signatures, bands):
+        first, second = units[i], units[j]
+        if first["page"] == second["page"]:
+            continue
+        similarity = jaccard(first["shingles"], second["shingles"])
+        if similarity >= threshold:
+            if first["page"] > second["page"]:
+                first, second = second, first
+            duplicates.append({
+                "pages": [first["page"], second["page"]],
+                "sections": [first["heading"], second["heading"]],
+                "similarity": round(similarity, 3),
+                "words": min(first["words"], second["words"]),
+            })
+
+    return sorted(duplicates, key=lambda pair: (-pair["similarity"], pair["pages"], pair["sections"]))
+
+
+def group_by_pages(duplicates):
+    """Return `{(page, page): [duplicate, ...]}` ordered by duplicated words"""
+
+    groups = {}
+    for duplicate in duplicates:
+        groups.setdefault(tuple(duplicate["pages"]), []).append(duplicate)
+    return dict(sorted(groups.items(), key=lambda item: -sum(pair["words"] for pair in item[1])))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report near-duplicate passages across pages")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"minimum shingle Jaccard similarity (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--level", choices=("section", "page"), default="section",
+                        help="compare sections or whole pages (default: section)")
+    parser.add_argument("--bands", type=int, default=BANDS,
+                        help=f"LSH bands; more bands find less similar pairs (default: {BANDS})")
+    parser.add_argument("--json", action="store_true", help="print the pairs as JSON")
+    args = parser.parse_args(argv)
+
+    units = collect_units(args.level)
+    duplicates = find_duplicates(units, args.threshold, args.bands)
+
+    if args.json:
+        json.dump(duplicates, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+
+    for (first, second), pairs in group_by_pages(duplicates).items():
+        words = sum(pair["words"] for pair in pairs)
+        print(f"🔁 {first} ↔ {second}: {len(pairs)} similar {args.level}s, ~{words} words")
+        for pair in pairs:
+            print(f"     {pair['similarity']:.2f}  {pair['sections'][0]}  ↔  {pair['sections'][1]}")
+
+    print(f"📊 {len(duplicates)} near-duplicate {args.level} pairs among {len(units)} {args.level}s "
+          f"(threshold {args.threshold})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
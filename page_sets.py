@@ -0,0 +1,749 @@
+"""
+Page sets of the wildfire directory: prompts, request builders and templates.
+
+The registry entries live in `registry.json`; this module pairs each set
+("models", "topics" and "content") with the prompt used to generate its pages,
+the chat request built for an entry, the Quarto template a completion is
+rendered into, and the index pages built from the set. It only needs the
+standard library, so planning, dry runs and index rebuilds never import the
+OpenAI client.
+"""
+
+import re
+import json
+from datetime import datetime
+
+from front_matter import load_index
+
+REGISTRY_FILE = "registry.json"
+
+# Placeholder rendered in place of the completion to find the template around it
+BODY_MARKER = "\x00GENERATED-BODY\x00"
+
+# Completion budget of one section in section-parallel generation
+SECTION_MAX_TOKENS = 1000
+
+# Section instructions in a prompt: a `## Heading` followed by its
+# instruction lines, or a numbered `N. Heading (instructions)` item
+SECTION_PATTERN = re.compile(
+    r"^[ \t]*(?:## (?P<heading>.+?)|\d+\. (?P<item>[^(\n]+?)(?: \((?P<hint>.+)\))?)[ \t]*\n"
+    r"(?P<body>(?:[ \t]*(?!\d+\. |## )\S.*\n)*)",
+    re.MULTILINE,
+)
+
+SECTION_INSTRUCTION = """
+    Write only the "{heading}" section of this page, starting with the heading "## {heading}".
+    Do not write any other section, introduction or conclusion.
+    {instructions}
+"""
+
+
+class PageSet:
+    """One registry set and the prompt and template its pages are built from"""
+
+    def __init__(self, name, description, system_prompt, prompt_template, max_tokens, render,
+                 index_pages=None, index_regions=None):
+        self.name = name
+        self.description = description
+        self.system_prompt = system_prompt
+        self.prompt_template = prompt_template
+        self.max_tokens = max_tokens
+        self.render = render
+        # index_pages(entries, titles) -> [(filename, content)] for the set's indexes
+        self.index_pages = index_pages
+        # index_regions(entries, titles) -> {filename: {region: content}} in existing pages
+        self.index_regions = index_regions
+
+    @property
+    def template(self):
+        """Prompt text that is part of each page's manifest fingerprint"""
+
+        return self.system_prompt + self.prompt_template
+
+    def build_request(self, entry):
+        """Build the chat completion request for a registry entry
+
+        The prompts keep the entry's values at the end, so every request of
+        a set starts with the same system prompt and instructions, byte for
+        byte, and the provider can serve that prefix from its prompt cache.
+        """
+
+        prompt = self.prompt_template.format(**entry)
+
+        return dict(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=self.max_tokens,
+            temperature=0.7
+        )
+
+    def generated_body(self, entry, text):
+        """Return the part of a rendered page that came from the completion
+
+        The template is rendered around a marker: the body starts after the
+        last line of the template's header (the closing `:::` of the callout,
+        or of the front matter) and ends at the divider before the footer's
+        first heading. Returns None if `text` does not have that shape.
+        """
+
+        head, tail = self.render(entry, BODY_MARKER).split(BODY_MARKER)
+        opening = head.rstrip().rsplit("\n", 1)[-1]
+        closing = next(line for line in tail.splitlines() if line.startswith("#"))
+
+        start = text.find(f"\n{opening}\n")
+        end = text.rfind(f"\n{closing}\n")
+        if start == -1 or end < start:
+            return None
+
+        body = text[start + len(opening) + 2:end].strip()
+        if body.endswith("---"):
+            body = body[:-3].rstrip()
+        return body
+
+    def sections(self):
+        """Return the `(heading, instructions)` of each section the prompt asks for"""
+
+        sections = []
+        for match in SECTION_PATTERN.finditer(self.prompt_template):
+            heading = (match.group("heading") or match.group("item")).strip()
+            lines = [match.group("hint") or ""] + match.group("body").splitlines()
+            sections.append((heading, "\n    ".join(line.strip() for line in lines if line.strip())))
+        return sections
+
+    def build_section_requests(self, entry):
+        """Build one chat completion request per section, in page order
+
+        Each prompt keeps the page's introduction and closing style notes but
+        replaces the list of sections with the instructions of one section.
+        """
+
+        matches = list(SECTION_PATTERN.finditer(self.prompt_template))
+        intro = self.prompt_template[:matches[0].start()]
+        intro = intro[:intro.rfind("Structure the content")].rstrip(" ")
+        closing = self.prompt_template[matches[-1].end():]
+
+        requests = []
+        for heading, instructions in self.sections():
+            section = SECTION_INSTRUCTION.format(heading=heading, instructions=instructions)
+            prompt = (intro + section.lstrip("\n") + closing).format(**entry)
+            requests.append((heading, dict(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=SECTION_MAX_TOKENS,
+                temperature=0.7
+            )))
+        return requests
+
+    def assemble_sections(self, sections):
+        """Join `[(heading, text)]` into one page body in the given order
+
+        A section whose completion left out its heading gets it back.
+        """
+
+        parts = []
+        for heading, text in sections:
+            text = text.strip()
+            if not re.match(rf"#+\s*{re.escape(heading)}", text, re.IGNORECASE):
+                text = f"## {heading}\n\n{text}"
+            parts.append(text)
+        return "\n\n".join(parts)
+
+
+def load_registry(path=REGISTRY_FILE):
+    """Load the registry entries of every page set"""
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def select_entries(entries, only):
+    """Return the entries named in `only` (filenames with or without `.qmd`)
+
+    Raises ValueError for names that are not in the set.
+    """
+
+    wanted = {name if name.endswith(".qmd") else f"{name}.qmd" for name in only}
+    unknown = wanted - {entry['filename'] for entry in entries}
+    if unknown:
+        raise ValueError(f"not in this set: {', '.join(sorted(unknown))}")
+
+    return [entry for entry in entries if entry['filename'] in wanted]
+
+
+def existing_pages(entries):
+    """Return `{filename: front matter}` for the entries whose page exists
+
+    Served from the persistent front matter index, which only re-reads pages
+    that changed since the last query.
+    """
+
+    index = load_index()
+    pages = {}
+    for entry in entries:
+        front_matter = index.get(entry['filename'])
+        if front_matter is not None:
+            pages[entry['filename']] = front_matter
+    return pages
+
+
+# White paper Appendix A models
+
+MODEL_SYSTEM_PROMPT = "You are an expert in wildfire modeling and simulation systems with deep knowledge of operational fire management tools."
+
+MODEL_PROMPT_TEMPLATE = """
+    Create a comprehensive research directory page for wildfire researchers and practitioners about the model or system described under "Model Details" at the end.
+    
+    Structure the content with these sections:
+    
+    ## Overview
+    Provide 2-3 paragraphs explaining what this model/system is, its primary purpose, and why it's important in wildfire management.
+    
+    ## Key Features and Capabilities
+    List and explain the main features and what makes this model unique.
+    
+    ## Technical Specifications
+    - Model type and approach
+    - Input data requirements
+    - Output products
+    - Spatial and temporal resolution
+    - Computational requirements
+    
+    ## Applications and Use Cases
+    - Operational uses
+    - Research applications
+    - Planning and management applications
+    - Case studies or notable deployments
+    
+    ## Strengths and Limitations
+    - What this model does well
+    - Known limitations or constraints
+    - Best use conditions
+    
+    ## Data Requirements
+    - Input data needed
+    - Data formats
+    - Data sources
+    
+    ## Training and Resources
+    - Available training materials
+    - Documentation
+    - User communities
+    - Support resources
+    
+    ## Integration with Other Systems
+    - Compatible models and systems
+    - Data exchange formats
+    - Workflow integration
+    
+    ## Recent Updates and Developments
+    - Latest version information
+    - Recent improvements
+    - Ongoing research
+    
+    ## Access and Availability
+    - How to obtain the software
+    - Licensing information
+    - System requirements
+    - Cost (if applicable)
+    
+    Write in a professional, technical tone suitable for researchers, fire managers, and practitioners.
+    Include specific technical details, actual use cases, and practical information.
+    Be comprehensive and accurate, focusing on practical application.
+    
+    Model Details:
+    - Name: {title}
+    - Category: {category}
+    - Type: {type}
+    - Organization: {organization}
+    - Focus areas: {focus}
+    """
+
+def create_model_qmd_file(model_info, content):
+    """Create a Quarto markdown file for a model"""
+
+    qmd_template = f"""---
+title: "{model_info['title']}"
+description: "Comprehensive guide to {model_info['title']} - {model_info['focus']}"
+date: {datetime.now().strftime('%Y-%m-%d')}
+categories: [{model_info['category']}]
+author: "AI Research Assistant"
+toc: true
+toc-depth: 3
+---
+
+# {model_info['title']}
+
+::: {{.callout-note}}
+## Quick Facts
+- **Category**: {model_info['category']}
+- **Model Type**: {model_info['type']}
+- **Developed by**: {model_info['organization']}
+- **Primary Focus**: {model_info['focus']}
+:::
+
+{content}
+
+---
+
+## Related Models and Resources
+
+### Similar Models in This Category
+Explore other {model_info['category'].lower()} models in our directory.
+
+### Integration Partners
+Models that commonly integrate with {model_info['title'].split(' - ')[0]}.
+
+---
+
+## Contributing to This Page
+
+This page is part of the [Wildfire Simulation & Modeling Research Directory](https://wildfire-directory.netlify.app) maintained by [Rallypoint One](https://rallypoint1.com).
+
+If you have:
+- Updates or corrections
+- Additional use cases or case studies
+- Training resources or documentation
+- Integration examples
+
+Please [open an issue on GitHub](https://github.com/RallypointOne/wildfire-directory/issues) or [contact us](https://rallypoint1.com/contact).
+
+---
+
+*Last updated: {datetime.now().strftime('%B %d, %Y')}*
+*This page was automatically generated using AI-assisted research. Content is regularly updated to reflect the latest developments.*
+"""
+
+    return qmd_template
+
+
+def group_by_category(entries):
+    """Return `{category: [entry, ...]}` in registry order"""
+
+    categories = {}
+    for entry in entries:
+        categories.setdefault(entry['category'], []).append(entry)
+    return categories
+
+
+def category_index_filename(category):
+    """Filename of the index page of a model category"""
+
+    return f"{category.lower().replace(' ', '-').replace('/', '-')}-index.qmd"
+
+
+def create_category_index_pages(models, titles=None):
+    """Create an index page for each category of the model registry
+
+    `titles` optionally maps page filenames to the title in their front
+    matter, which is then used for the link text instead of the registry
+    title. Pages are grouped in a single pass and each page is assembled
+    with one join.
+    """
+
+    titles = titles or {}
+    index_pages = []
+
+    for category, models in group_by_category(models).items():
+        listings = "".join(f"""
+### [{titles.get(model['filename'], model['title'])}]({model['filename']})
+**Organization**: {model['organization']}  
+**Type**: {model['type']}  
+**Focus**: {model['focus']}
+
+---
+""" for model in models)
+
+        content = "".join((f"""---
+title: "{category}"
+description: "Complete listing of {category.lower()} for wildfire research and operations"
+date: {datetime.now().strftime('%Y-%m-%d')}
+toc: true
+---
+
+# {category}
+
+This section contains detailed information about {len(models)} {category.lower()} used in wildfire research and operations.
+
+## Models in This Category
+
+""", listings, f"""
+
+## Category Overview
+
+The {category} category includes models and systems that focus on specific aspects of wildfire behavior, management, and analysis. These tools are essential for:
+
+- Operational decision-making
+- Research and development
+- Planning and risk assessment
+- Training and education
+
+## Choosing the Right Model
+
+When selecting a model from this category, consider:
+- Your specific use case and objectives
+- Available data and computational resources
+- Required spatial and temporal resolution
+- Integration with existing workflows
+- Training and support availability
+
+---
+
+*Part of the [Wildfire Research Directory](https://wildfire-directory.netlify.app) by [Rallypoint One](https://rallypoint1.com)*
+"""))
+
+        index_pages.append((category_index_filename(category), content))
+
+    return index_pages
+
+
+# Essential wildfire topics
+
+TOPIC_SYSTEM_PROMPT = "You are a leading expert in wildfire science, fire management, and risk assessment with deep knowledge of operational tools, research methods, and policy applications."
+
+TOPIC_PROMPT_TEMPLATE = """
+    Create a comprehensive, authoritative research directory page about the topic described under "Topic Details" at the end.
+    
+    Structure the content with these detailed sections:
+    
+    ## Overview
+    Provide 3-4 paragraphs explaining this topic's importance, current state, and role in wildfire management and research.
+    
+    ## Core Concepts and Principles
+    Explain the fundamental concepts, theories, and scientific principles underlying this topic.
+    
+    ## Methods and Approaches
+    Detail the main methodologies, techniques, and approaches used in this area.
+    
+    ## Current Tools and Technologies
+    List and describe specific tools, software, platforms, and technologies currently used.
+    Include both operational and research tools.
+    
+    ## Data Sources and Requirements
+    - Key datasets used
+    - Data collection methods
+    - Data formats and standards
+    - Availability and access
+    
+    ## Applications and Use Cases
+    Provide real-world examples of how this is applied in:
+    - Operational fire management
+    - Research studies
+    - Planning and policy
+    - Risk assessment
+    
+    ## Case Studies and Examples
+    Describe 2-3 specific examples or case studies demonstrating successful application.
+    
+    ## Current Research and Developments
+    - Active research areas
+    - Recent advances
+    - Emerging technologies
+    - Future directions
+    
+    ## Challenges and Limitations
+    - Technical challenges
+    - Operational constraints
+    - Data limitations
+    - Areas needing improvement
+    
+    ## Best Practices and Guidelines
+    - Industry standards
+    - Recommended procedures
+    - Quality assurance
+    - Common pitfalls to avoid
+    
+    ## Integration with Other Systems
+    How this topic connects with other wildfire management tools and approaches.
+    
+    ## Resources and Training
+    - Educational resources
+    - Training programs
+    - Certification options
+    - Professional organizations
+    - Key publications
+    
+    ## Stakeholders and Users
+    Who uses this information and how:
+    - Fire managers
+    - Researchers
+    - Policy makers
+    - Communities
+    - Industry sectors
+    
+    Write in a professional, technical tone suitable for researchers, practitioners, and decision-makers.
+    Include specific examples, actual tools, and practical guidance.
+    Be comprehensive, accurate, and focused on real-world application.
+    Make this the definitive reference page for this topic.
+    
+    Topic Details:
+    - Topic: {title}
+    - Category: {category}
+    - Focus areas: {focus}
+    - Description: {description}
+    """
+
+def create_topic_qmd_file(topic_info, content):
+    """Create a Quarto markdown file for a topic"""
+
+    qmd_template = f"""---
+title: "{topic_info['title']}"
+description: "{topic_info['description']}"
+date: {datetime.now().strftime('%Y-%m-%d')}
+categories: [{topic_info['category']}]
+author: "AI Research Assistant - Rallypoint One"
+toc: true
+toc-depth: 3
+---
+
+# {topic_info['title']}
+
+::: {{.callout-important}}
+## Topic Overview
+**Category**: {topic_info['category']}  
+**Focus Areas**: {topic_info['focus']}  
+**Last Updated**: {datetime.now().strftime('%B %d, %Y')}
+:::
+
+{content}
+
+---
+
+## Related Topics in This Directory
+
+### Related Models and Systems
+Browse our comprehensive [model directory](index.qmd) for specific simulation and modeling tools related to this topic.
+
+### Integration Opportunities
+This topic integrates with multiple models and systems documented in our directory. See specific model pages for technical integration details.
+
+---
+
+## Contributing to This Page
+
+This page is part of the [Wildfire Simulation & Modeling Research Directory](https://wildfire-directory.netlify.app) maintained by [Rallypoint One](https://rallypoint1.com).
+
+### How You Can Contribute:
+- **Share Case Studies**: Document successful applications of these methods
+- **Provide Updates**: Submit new tools, research, or methodologies
+- **Report Corrections**: Help us maintain accuracy
+- **Add Resources**: Share training materials or documentation
+
+**Contact Options:**
+- [Open an Issue on GitHub](https://github.com/RallypointOne/wildfire-directory/issues)
+- [Contact Rallypoint One](https://rallypoint1.com/contact)
+- Email: info@rallypoint1.com
+
+---
+
+## Professional Services
+
+**Rallypoint One** offers consulting services related to {topic_info['category'].lower()}:
+- Implementation support
+- Custom analysis and modeling
+- Training and capacity building
+- Risk assessment and planning
+- Technology integration
+
+[Learn more about our services](https://rallypoint1.com)
+
+---
+
+*This page was automatically generated using AI-assisted research and is continuously updated to reflect the latest developments in wildfire science and management.*
+
+*Part of the NSF ASCEND Engine Wildfire Research Initiative*
+"""
+
+    return qmd_template
+
+def topic_links(topics, titles, nav=False):
+    """Return the topic link lists grouped under a heading per display group
+
+    Topics are grouped by their registry `group` (or `nav_group` for the
+    navigation snippet), falling back to their category. The navigation
+    snippet links with a topic's `short_title` where it has one.
+    """
+
+    groups = {}
+    for topic in topics:
+        group = (nav and topic.get('nav_group')) or topic.get('group') or topic['category']
+        groups.setdefault(group, []).append(topic)
+
+    def label(topic):
+        title = titles.get(topic['filename'], topic['title'])
+        return topic.get('short_title', title) if nav else title
+
+    return "\n".join(
+        f"### {group}\n" + "".join(f"- [{label(topic)}]({topic['filename']})\n" for topic in entries)
+        for group, entries in groups.items()
+    )
+
+
+def create_topics_index(topics, titles=None):
+    """Create the index page listing every topic page by display group"""
+
+    titles = titles or {}
+    return "".join((f"""---
+title: "Essential Wildfire Topics"
+description: "Comprehensive guides to key wildfire science and management topics"
+date: {datetime.now().strftime('%Y-%m-%d')}
+toc: true
+---
+
+# Essential Wildfire Topics
+
+Beyond individual models and systems, these comprehensive guides cover critical topics in wildfire science, management, and risk assessment.
+
+## Topics by Category
+
+""", topic_links(topics, titles), """
+## Why These Topics Matter
+
+These topics represent critical areas of wildfire science and management that:
+- Bridge multiple modeling approaches
+- Address emerging challenges
+- Support decision-making at all levels
+- Integrate traditional and modern knowledge
+- Enable comprehensive risk assessment
+
+## How to Use These Guides
+
+Each topic page provides:
+1. **Comprehensive Overview** - Current state of knowledge
+2. **Practical Applications** - Real-world implementation
+3. **Tools and Resources** - Specific software and datasets
+4. **Case Studies** - Documented examples
+5. **Future Directions** - Emerging research and needs
+
+---
+
+*Part of the [Wildfire Research Directory](https://wildfire-directory.netlify.app) by [Rallypoint One](https://rallypoint1.com)*
+"""))
+
+def update_main_navigation(topics, titles=None):
+    """Generate code to add these topics to the main navigation"""
+
+    titles = titles or {}
+    return "".join(("""
+## 📚 Essential Topics
+
+Our directory now includes comprehensive guides on critical wildfire topics:
+
+""", topic_links(topics, titles, nav=True), """
+[View All Essential Topics](essential-topics-index.qmd)
+"""))
+
+
+def create_topic_index_pages(topics, titles=None):
+    """Return the essential topics index page and navigation snippet"""
+
+    return [
+        ('essential-topics-index.qmd', create_topics_index(topics, titles)),
+        ('nav-update.txt', update_main_navigation(topics, titles)),
+    ]
+
+
+# AI research topics
+
+CONTENT_SYSTEM_PROMPT = "You are an expert in wildfire modeling and simulation research."
+
+CONTENT_PROMPT_TEMPLATE = """
+    Create a comprehensive research directory page for wildfire researchers about the topic described under "Topic Details" at the end.
+    
+    Structure the content with these sections:
+    1. Overview (2-3 paragraphs explaining the topic and its importance)
+    2. Key Concepts (main technical concepts and terminology)
+    3. Current Research (latest developments and active research areas)
+    4. Software and Tools (specific tools, models, and software packages)
+    5. Research Groups and Institutions (major contributors to this field)
+    6. Datasets and Resources (available data sources)
+    7. Recent Publications (important papers - just titles and brief descriptions)
+    8. Challenges and Future Directions
+    
+    Write in a professional, technical tone suitable for researchers and practitioners.
+    Include specific model names, research institutions, and technical details.
+    Make the content informative and comprehensive.
+    
+    Topic Details:
+    - Topic: {title}
+    - Category: {category}
+    - Focus areas: {focus}
+    """
+
+def create_qmd_file(topic_info, content):
+    """Create a Quarto markdown file with the generated content"""
+
+    qmd_template = f"""---
+title: "{topic_info['title']}"
+description: "Comprehensive resource on {topic_info['title'].lower()} in wildfire research"
+date: {datetime.now().strftime('%Y-%m-%d')}
+categories: [{topic_info['category']}]
+author: "AI Research Assistant"
+toc: true
+---
+
+{content}
+
+---
+
+## How to Contribute
+
+If you have corrections, additions, or suggestions for this page, please:
+1. [Open an issue on GitHub](https://github.com/RallypointOne/wildfire-directory/issues)
+2. [Contact Rallypoint One](https://rallypoint1.com/contact)
+
+---
+
+*This page was automatically generated using AI-assisted research on {datetime.now().strftime('%B %d, %Y')}. Content is regularly updated to reflect the latest developments in wildfire research.*
+
+*Part of the [Wildfire Research Directory](https://wildfire-directory.netlify.app) by [Rallypoint One](https://rallypoint1.com)*
+"""
+
+    return qmd_template
+
+# Heading of a page that its new managed regions are inserted before
+REGION_ANCHORS = {"index.qmd": "Quick Links"}
+
+
+def create_homepage_regions(topics, titles=None):
+    """Return the homepage region linking the research topic pages
+
+    `{"index.qmd": {region name: markdown}}`, kept up to date in place by
+    `managed_regions.update_regions`.
+    """
+
+    titles = titles or {}
+    links = "".join(
+        f"- [{titles.get(topic['filename'], topic['title'])}]({topic['filename']}) - {topic['category']}\n"
+        for topic in topics
+    )
+
+    return {"index.qmd": {"ai-research-topics": f"""## AI-Generated Research Topics
+
+Explore our comprehensive research pages:
+
+{links}"""}}
+
+
+PAGE_SETS = {
+    "models": PageSet(
+        "models", "wildfire model pages from the white paper Appendix A",
+        MODEL_SYSTEM_PROMPT, MODEL_PROMPT_TEMPLATE, 2500, create_model_qmd_file,
+        index_pages=create_category_index_pages,
+    ),
+    "topics": PageSet(
+        "topics", "essential wildfire topic pages",
+        TOPIC_SYSTEM_PROMPT, TOPIC_PROMPT_TEMPLATE, 3000, create_topic_qmd_file,
+        index_pages=create_topic_index_pages,
+    ),
+    "content": PageSet(
+        "content", "AI research topic pages",
+        CONTENT_SYSTEM_PROMPT, CONTENT_PROMPT_TEMPLATE, 2000, create_qmd_file,
+        index_regions=create_homepage_regions,
+    ),
+}
@@ -0,0 +1,167 @@
+"""
+Precompressed variants of the rendered site.
+
+Walks `_site` after rendering and writes a `.gz` (and, with the `brotli`
+package installed, a `.br`) next to every text asset at the highest
+compression level, so the server can hand out the smaller variant without
+compressing on every request. Files are compressed in parallel across cores.
+
+`asset-manifest.json` in the site records the SHA-256 of every asset. It is
+read back on the next build, and files whose hash is unchanged and whose
+variants exist are skipped. The same hashes can serve as ETags or to decide
+which assets get long-lived cache headers.
+
+Usage:
+    python precompress.py             # after rendering _site
+    python precompress.py --force     # recompress everything
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from atomic_file import atomic_write
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SITE_DIR = "_site"
+ASSET_MANIFEST = "asset-manifest.json"
+DEFAULT_JOBS = os.cpu_count() or 1
+
+COMPRESSIBLE = {".html", ".css", ".js", ".json", ".xml", ".svg", ".txt", ".map", ".ico", ".ttf", ".otf"}
+
+# Below this size the compressed variant saves less than a network packet
+MIN_SIZE = 1024
+
+
+def variants():
+    """Return the file suffixes this run writes"""
+
+    return (".gz", ".br") if brotli else (".gz",)
+
+
+def find_assets(site_dir=SITE_DIR):
+    """Yield the site-relative paths of every compressible file"""
+
+    for directory, dirnames, filenames in os.walk(site_dir):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = os.path.relpath(os.path.join(directory, name), site_dir)
+            if os.path.splitext(name)[1] in COMPRESSIBLE and path != ASSET_MANIFEST:
+                yield path
+
+
+def write_bytes(path, data):
+    """Atomically write bytes to a file"""
+
+    atomic_write(path, data)
+
+
+def compress_file(path):
+    """Write the compressed variants of one file; returns their sizes"""
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    write_bytes(path + ".gz", compressed)
+    sizes = {".gz": len(compressed)}
+    if brotli:
+        compressed = brotli.compress(data, quality=11)
+        write_bytes(path + ".br", compressed)
+        sizes[".br"] = len(compressed)
+    return sizes
+
+
+def load_asset_manifest(site_dir=SITE_DIR):
+    try:
+        with open(os.path.join(site_dir, ASSET_MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def precompress(site_dir=SITE_DIR, jobs=DEFAULT_JOBS, force=False):
+    """Compress every new or changed asset and update the manifest
+
+    Returns `(compressed, skipped, removed)` counts.
+    """
+
+    previous = load_asset_manifest(site_dir)
+    manifest = {}
+    pending = []
+
+    for asset in find_assets(site_dir):
+        path = os.path.join(site_dir, asset)
+        with open(path, "rb") as f:
+            data = f.read()
+        manifest[asset] = {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+
+        if len(data) < MIN_SIZE:
+            continue
+        manifest[asset]["variants"] = list(variants())
+        unchanged = (previous.get(asset, {}).get("sha256") == manifest[asset]["sha256"]
+                     and all(os.path.exists(path + suffix) for suffix in variants()))
+        if force or not unchanged:
+            pending.append(asset)
+
+    # Variants of assets that were removed or fell below the size threshold,
+    # and variants this run no longer writes (brotli was not installed)
+    removed = 0
+    for asset, record in previous.items():
+        current = manifest.get(asset, {}).get("variants", [])
+        for suffix in record.get("variants", []):
+            if suffix not in current and os.path.exists(os.path.join(site_dir, asset + suffix)):
+                os.remove(os.path.join(site_dir, asset + suffix))
+                removed += 1
+
+    if pending:
+        paths = [os.path.join(site_dir, asset) for asset in pending]
+        with ProcessPoolExecutor(max_workers=max(1, min(jobs, len(paths)))) as executor:
+            for asset, sizes in zip(pending, executor.map(compress_file, paths, chunksize=8)):
+                manifest[asset]["compressed"] = sizes
+    for asset, record in manifest.items():
+        # Assets below the size threshold have no variants and no sizes
+        if asset not in pending and "variants" in record and "compressed" in previous.get(asset, {}):
+            record["compressed"] = {suffix: size for suffix, size in previous[asset]["compressed"].items()
+                                    if suffix in record["variants"]}
+
+    write_bytes(os.path.join(site_dir, ASSET_MANIFEST),
+                (json.dumps(manifest, indent=1, sort_keys=True) + "\n").encode("utf-8"))
+
+    skipped = sum(1 for record in manifest.values() if "variants" in record) - len(pending)
+    return len(pending), skipped, removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write .gz and .br variants of the rendered site")
+    parser.add_argument("--site-dir", default=SITE_DIR, help=f"rendered site directory (default: {SITE_DIR})")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"parallel compression processes (default: {DEFAULT_JOBS})")
+    parser.add_argument("--force", action="store_true", help="recompress files even if unchanged")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.site_dir):
+        print(f"❌ {args.site_dir} does not exist, render the site first")
+        return 1
+    if brotli is None:
+        print("⚠️ brotli is not installed, writing .gz variants only (pip install brotli)")
+
+    start = time.perf_counter()
+    compressed, skipped, removed = precompress(args.site_dir, args.jobs, args.force)
+    print(f"🗜️ Compressed {compressed} files, {skipped} unchanged, {removed} stale variants removed "
+          f"in {time.perf_counter() - start:.1f}s")
+    print(f"📦 Asset manifest written to {os.path.join(args.site_dir, ASSET_MANIFEST)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Token-bucket rate limiting for OpenAI requests.
+
+Every completion request takes one slot from a requests-per-minute bucket and
+its estimated token cost from a tokens-per-minute bucket. Workers block until
+both buckets can cover the request, so concurrent generation runs at the
+highest sustained rate the account allows instead of bursting into 429s.
+When the API does answer with a 429 the limiter pauses all workers for the
+advertised Retry-After and temporarily slows down, then recovers gradually.
+"""
+
+import time
+import threading
+
+DEFAULT_RPM = 500
+DEFAULT_TPM = 90000
+
+# Seconds of budget a bucket may accumulate while idle
+BURST_SECONDS = 10
+
+# Rough number of characters per token for English prompts
+CHARS_PER_TOKEN = 4
+
+# Fallback pause when a 429 response carries no Retry-After header
+DEFAULT_RETRY_AFTER = 5.0
+
+# Adaptive slowdown applied on 429s and recovered on successful requests
+MIN_RATE_SCALE = 0.25
+RATE_DECREASE = 0.8
+RATE_RECOVERY = 0.1
+
+
+def estimate_tokens(payload):
+    """Estimate the token cost of a chat request: prompt size plus max_tokens"""
+
+    prompt_chars = sum(len(message.get("content") or "") for message in payload.get("messages", []))
+    return prompt_chars // CHARS_PER_TOKEN + payload.get("max_tokens", 0)
+
+
+class TokenBucket:
+    """A bucket refilled continuously at `per_minute` units per minute"""
+
+    def __init__(self, per_minute, burst_seconds=BURST_SECONDS):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now, scale):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate * scale)
+        self.updated = now
+
+    def wait_time(self, amount, scale):
+        """Seconds until `amount` units are available (capped at capacity)"""
+
+        shortfall = min(amount, self.capacity) - self.level
+        return max(0.0, shortfall / (self.rate * scale))
+
+    def take(self, amount):
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Shared RPM/TPM limiter for all generation workers
+
+    A budget of 0 disables the corresponding bucket.
+    """
+
+    def __init__(self, rpm=DEFAULT_RPM, tpm=DEFAULT_TPM):
+        self._requests = TokenBucket(rpm) if rpm else None
+        self._tokens = TokenBucket(tpm) if tpm else None
+        self._scale = 1.0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens):
+        """Block until one request costing `tokens` tokens may be sent"""
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._paused_until - now
+
+                if wait <= 0:
+                    demands = [(bucket, amount) for bucket, amount in
+                               ((self._requests, 1), (self._tokens, tokens)) if bucket]
+                    for bucket, _ in demands:
+                        bucket.refill(now, self._scale)
+                    wait = max([bucket.wait_time(amount, self._scale) for bucket, amount in demands], default=0.0)
+
+                    if wait <= 0:
+                        for bucket, amount in demands:
+                            bucket.take(amount)
+                        return
+
+            time.sleep(wait)
+
+    def record_success(self):
+        """Let the sending rate creep back up after a slowdown"""
+
+        with self._lock:
+            self._scale = min(1.0, self._scale + RATE_RECOVERY)
+
+    def record_rate_limited(self, retry_after=None):
+        """Pause every worker and slow down after the API returned a 429"""
+
+        pause = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            self._scale = max(MIN_RATE_SCALE, self._scale * RATE_DECREASE)
+
+
+def retry_after_seconds(error):
+    """Return the Retry-After delay of an API error in seconds, if any"""
+
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+
+    for header, factor in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            return float(value) * factor
+        except ValueError:
+            continue
+
+    return None
+
+
+def is_rate_limited(error):
+    """Return True if an API error is a 429 Too Many Requests response"""
+
+    return getattr(error, "status_code", None) == 429
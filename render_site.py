@@ -0,0 +1,201 @@
+"""
+Incremental Quarto render of the directory site.
+
+A full `quarto render` re-renders every page even when a single page
+changed. This driver hashes every page and the site-wide inputs, compares
+them with the build manifest written next to `_site` by the previous
+successful build, and renders only:
+
+- pages whose content changed or that are new,
+- pages that link to a page that was added or removed (their link targets
+  resolve differently), and
+- pages with a `listing` in their front matter, which aggregate other pages.
+
+Pages that were removed have their HTML output deleted. Any change to the
+site configuration (`_quarto.yml`, styles), a missing `_site` or a missing
+manifest falls back to a full render.
+
+Usage:
+    python render_site.py             # incremental render
+    python render_site.py --dry-run   # show what would be rendered
+    python render_site.py --full      # render everything and reset the manifest
+"""
+
+import os
+import sys
+import json
+import glob
+import hashlib
+import argparse
+import subprocess
+from datetime import datetime, timezone
+
+from atomic_file import atomic_write
+from front_matter import find_pages, load_index
+from link_graph import page_links
+
+SITE_DIR = "_site"
+BUILD_MANIFEST = ".site-build.json"
+
+# Site-wide inputs; any change to these re-renders the whole site
+CONFIG_PATTERNS = ("_quarto.yml", "_quarto-*.yml", "_metadata.yml", "*.scss", "*.css")
+
+
+def file_hash(path):
+    """Return the SHA-256 of a file's bytes"""
+
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def config_hash(root="."):
+    """Return one hash over every site-wide configuration file"""
+
+    digest = hashlib.sha256()
+    for pattern in CONFIG_PATTERNS:
+        for path in sorted(glob.glob(os.path.join(root, pattern))):
+            digest.update(os.path.relpath(path, root).encode("utf-8"))
+            digest.update(file_hash(path).encode("ascii"))
+    return digest.hexdigest()
+
+
+def output_path(page, site_dir=SITE_DIR):
+    """Return the HTML file Quarto renders a page to"""
+
+    return os.path.join(site_dir, os.path.splitext(page)[0] + ".html")
+
+
+def load_build_manifest(path=BUILD_MANIFEST):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_build_manifest(manifest, path=BUILD_MANIFEST):
+    """Atomically write the build manifest"""
+
+    atomic_write(path, json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+
+
+def plan_render(manifest, pages, hashes, config, site_dir=SITE_DIR):
+    """Work out what to render; returns a dict with the reasons per page
+
+    `plan["full"]` is set when the whole site has to be rendered.
+    """
+
+    plan = {"full": None, "changed": [], "dependents": [], "removed": []}
+
+    if manifest is None:
+        plan["full"] = "no previous build manifest"
+    elif not os.path.isdir(site_dir):
+        plan["full"] = f"{site_dir} is missing"
+    elif manifest.get("config") != config:
+        plan["full"] = "site configuration changed"
+    if plan["full"]:
+        return plan
+
+    previous = manifest.get("pages", {})
+    plan["changed"] = [page for page in pages if previous.get(page) != hashes[page]]
+    plan["removed"] = sorted(page for page in previous if page not in hashes)
+
+    added = {page for page in plan["changed"] if page not in previous}
+    moved = added | set(plan["removed"])
+    changed = set(plan["changed"])
+    index = load_index()
+
+    for page in pages:
+        if page in changed:
+            continue
+        if "listing" in (index.get(page) or {}) or (moved and page_links(page) & moved):
+            plan["dependents"].append(page)
+
+    return plan
+
+
+def print_render_plan(plan):
+    if plan["full"]:
+        print(f"🏗️ Full render: {plan['full']}")
+        return
+
+    print("🗺️ Render plan:")
+    for status in ("changed", "dependents", "removed"):
+        print(f"  - {status.capitalize()}: {len(plan[status])}")
+        for page in plan[status]:
+            print(f"      {page}")
+
+
+def quarto_render(quarto, target=None):
+    """Run `quarto render` on the project or one page; returns the exit code"""
+
+    command = [quarto, "render"] + ([target] if target else [])
+    print(f"▶️ {' '.join(command)}")
+    return subprocess.call(command)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render only the pages of the site that changed")
+    parser.add_argument("--full", action="store_true", help="render the whole site")
+    parser.add_argument("--dry-run", action="store_true", help="print the render plan without rendering")
+    parser.add_argument("--quarto", default="quarto", help="quarto executable (default: quarto)")
+    parser.add_argument("--manifest", default=BUILD_MANIFEST,
+                        help=f"build manifest file (default: {BUILD_MANIFEST})")
+    args = parser.parse_args(argv)
+
+    pages = list(find_pages())
+    hashes = {page: file_hash(page) for page in pages}
+    config = config_hash()
+
+    manifest = load_build_manifest(args.manifest)
+    plan = plan_render(manifest, pages, hashes, config)
+    if args.full:
+        plan["full"] = "--full"
+    print_render_plan(plan)
+
+    if args.dry_run:
+        return 0
+
+    # Pages whose hash is recorded only once they rendered successfully
+    rendered = dict(manifest.get("pages", {})) if manifest and not plan["full"] else {}
+
+    if plan["full"]:
+        if quarto_render(args.quarto) != 0:
+            print("❌ Render failed")
+            return 1
+        rendered = dict(hashes)
+    else:
+        for page in plan["removed"]:
+            rendered.pop(page, None)
+            if os.path.exists(output_path(page)):
+                os.remove(output_path(page))
+                print(f"🗑️ Removed {output_path(page)}")
+
+        targets = plan["changed"] + plan["dependents"]
+        failed = []
+        for page in targets:
+            if quarto_render(args.quarto, page) == 0:
+                rendered[page] = hashes[page]
+            else:
+                failed.append(page)
+
+        if failed:
+            save_build_manifest(dict(manifest, pages=rendered), args.manifest)
+            print(f"❌ {len(failed)} pages failed to render: {', '.join(failed)}")
+            return 1
+
+        if not targets and not plan["removed"]:
+            print("✨ Site is up to date, nothing to render")
+
+    save_build_manifest({
+        "config": config,
+        "pages": rendered,
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "rendered": pages if plan["full"] else plan["changed"] + plan["dependents"],
+    }, args.manifest)
+    print(f"📦 Build manifest written to {args.manifest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
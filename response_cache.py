@@ -0,0 +1,98 @@
+"""
+Content-addressed on-disk cache for OpenAI chat completions.
+
+Each completion is stored under the SHA-256 of its full request payload
+(model, messages, max_tokens, temperature, ...), so a rerun with unchanged
+prompts is served locally with no API call. The cache is bounded in size and
+evicts the least recently used entries first.
+"""
+
+import os
+import json
+import hashlib
+import threading
+
+from atomic_file import atomic_write
+
+DEFAULT_CACHE_DIR = ".gen-cache"
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+def payload_key(payload):
+    """Return the cache key for a chat completion request payload"""
+
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Persistent LRU cache of completion text keyed by request payload
+
+    `read=False` skips lookups but still stores fresh responses, which is how
+    `--refresh` repopulates the cache without serving stale entries.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, read=True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.read = read
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, payload):
+        """Return the cached completion for `payload`, or None on a miss"""
+
+        if not self.read:
+            return None
+
+        path = self._path(payload_key(payload))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # Bump the modification time so eviction treats this entry as recently used
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        return entry.get("content")
+
+    def put(self, payload, content):
+        """Store the completion for `payload` and evict old entries if needed"""
+
+        entry = {"request": payload, "content": content}
+        atomic_write(self._path(payload_key(payload)), json.dumps(entry, ensure_ascii=False))
+
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.directory):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
@@ -0,0 +1,85 @@
+"""
+Retry classification and dead-letter queue for page generation.
+
+Transient API failures (timeouts, connection errors, 429s and 5xx responses)
+are retried with exponential backoff and full jitter; permanent ones
+(authentication, invalid requests) fail immediately. Pages that still fail
+are written to a dead-letter file so `--retry-failed` can replay just those
+pages instead of the whole batch.
+"""
+
+import os
+import json
+import random
+from datetime import datetime, timezone
+
+from atomic_file import atomic_write
+
+DEFAULT_MAX_ATTEMPTS = 5
+BASE_DELAY = 1.0
+MAX_DELAY = 60.0
+
+DEAD_LETTER_FILE = "generation-dead-letter.json"
+
+TRANSIENT_STATUS_CODES = {408, 409, 429}
+TRANSIENT_ERROR_NAMES = {"APIConnectionError", "APITimeoutError"}
+
+
+def is_transient(error):
+    """Return True if a failed request is worth retrying"""
+
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in TRANSIENT_STATUS_CODES or status >= 500
+
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+
+    return any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def backoff_delay(attempt, base=BASE_DELAY, cap=MAX_DELAY):
+    """Return a full-jitter exponential backoff delay for a 1-based attempt"""
+
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class DeadLetterQueue:
+    """Persisted record of pages whose generation failed, keyed by set"""
+
+    def __init__(self, path=DEAD_LETTER_FILE):
+        self.path = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except FileNotFoundError:
+            self.entries = {}
+
+    def pending(self, set_name):
+        """Return the filenames of failed pages in a registry set"""
+
+        return set(self.entries.get(set_name, {}))
+
+    def record_failure(self, set_name, entry, error):
+        self.entries.setdefault(set_name, {})[entry['filename']] = {
+            "title": entry['title'],
+            "error": str(error),
+            "transient": is_transient(error) if isinstance(error, Exception) else False,
+            "failed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+
+    def record_success(self, set_name, entry):
+        failed = self.entries.get(set_name, {})
+        failed.pop(entry['filename'], None)
+        if not failed:
+            self.entries.pop(set_name, None)
+
+    def save(self):
+        """Atomically write the queue, removing the file once it is empty"""
+
+        if not self.entries:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+
+        atomic_write(self.path, json.dumps(self.entries, indent=2, sort_keys=True, ensure_ascii=False) + "\n")
@@ -0,0 +1,93 @@
+"""
+Run journal for checkpointing and resuming long generation runs.
+
+Each run gets an id and an append-only JSONL journal under `.gen-runs/`. The
+first line lists the pages the run set out to generate; every page that is
+written successfully appends one line, flushed and fsynced before the next
+page is acknowledged. `--resume <run-id>` reads the journal back and only
+generates the pages that never completed. A run that finishes deletes its
+journal, so `.gen-runs/` only holds interrupted runs.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, timezone
+
+RUNS_DIR = ".gen-runs"
+
+
+def _timestamp():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class RunJournal:
+    """Append-only record of one generation run"""
+
+    def __init__(self, run_id, set_name, pending, completed=(), directory=RUNS_DIR):
+        self.run_id = run_id
+        self.set_name = set_name
+        self.pending = list(pending)
+        self.completed = set(completed)
+        self.path = os.path.join(directory, f"{run_id}.jsonl")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def start(cls, set_name, pending, directory=RUNS_DIR):
+        """Create the journal for a new run of `pending` filenames"""
+
+        run_id = f"{set_name}-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
+        journal = cls(run_id, set_name, pending, directory=directory)
+
+        os.makedirs(directory, exist_ok=True)
+        journal._append({
+            "run_id": run_id,
+            "set": set_name,
+            "pending": journal.pending,
+            "started_at": _timestamp(),
+        })
+        return journal
+
+    @classmethod
+    def load(cls, run_id, directory=RUNS_DIR):
+        """Read back the journal of an earlier run"""
+
+        path = os.path.join(directory, f"{run_id}.jsonl")
+        with open(path, "r", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+
+        header = lines[0]
+        completed = [line["filename"] for line in lines[1:] if "filename" in line]
+        return cls(run_id, header["set"], header["pending"], completed, directory=directory)
+
+    @property
+    def remaining(self):
+        """Filenames of the run that have not been generated yet"""
+
+        return [filename for filename in self.pending if filename not in self.completed]
+
+    def record_completed(self, filename):
+        """Durably record that a page was written"""
+
+        self.completed.add(filename)
+        self._append({"filename": filename, "completed_at": _timestamp()})
+
+    def finish(self):
+        """Remove the journal of a run that got to the end
+
+        Pages that failed are in the dead-letter file by then, so only
+        interrupted runs keep a journal to resume from.
+        """
+
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _append(self, record):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
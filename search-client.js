@@ -0,0 +1,73 @@
+// Lazy client for the sharded search index written by search_index.py.
+//
+//   const results = await WildfireSearch.search("fuel moisture", {category: "Fuel Moisture Models"});
+//
+// Only meta.json.gz and docs.json.gz are fetched up front; each term shard
+// is fetched the first time a query word needs it and kept in memory.
+const WildfireSearch = (() => {
+  const base = new URL(".", document.currentScript ? document.currentScript.src : location.href);
+  const stopwords = new Set(("a an and are as at be by can for from has have in into is it its of on or " +
+    "such that the their these this to was were which with will").split(" "));
+  const shards = new Map();
+  let ready = null;
+
+  async function fetchJson(name) {
+    const response = await fetch(new URL(name, base));
+    const stream = response.body.pipeThrough(new DecompressionStream("gzip"));
+    return new Response(stream).json();
+  }
+
+  function load() {
+    ready = ready || Promise.all([fetchJson("meta.json.gz"), fetchJson("docs.json.gz")]);
+    return ready;
+  }
+
+  function shard(prefix) {
+    if (!shards.has(prefix)) shards.set(prefix, fetchJson(`terms-${prefix}.json.gz`));
+    return shards.get(prefix);
+  }
+
+  function tokenize(text) {
+    return (text.toLowerCase().match(/[a-z0-9]+/g) || []).filter((t) => t.length > 1 && !stopwords.has(t));
+  }
+
+  async function search(query, facets = {}, limit = 10) {
+    const [meta, docs] = await load();
+    let scores = null;
+
+    for (const token of tokenize(query)) {
+      const prefix = token.slice(0, meta.prefix_length);
+      if (!meta.shards.includes(prefix)) return [];
+      const terms = await shard(prefix);
+
+      const matches = new Map();
+      for (const [term, postings] of Object.entries(terms)) {
+        if (!term.startsWith(token)) continue;
+        const idf = Math.log(1 + meta.documents / postings.length);
+        for (const [doc, weight] of postings) matches.set(doc, (matches.get(doc) || 0) + weight * idf);
+      }
+      if (scores === null) {
+        scores = matches;
+      } else {
+        for (const doc of [...scores.keys()]) {
+          if (matches.has(doc)) scores.set(doc, scores.get(doc) + matches.get(doc));
+          else scores.delete(doc);
+        }
+      }
+    }
+    if (!scores) return [];
+
+    for (const [facet, value] of Object.entries(facets)) {
+      const allowed = new Set(((meta.facets[facet] || {})[value]) || []);
+      for (const doc of [...scores.keys()]) if (!allowed.has(doc)) scores.delete(doc);
+    }
+
+    return [...scores.entries()]
+      .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+      .slice(0, limit)
+      .map(([doc, score]) => Object.assign(
+        Object.fromEntries(meta.fields.map((field, i) => [field, docs[doc][i]])), {score}));
+  }
+
+  return {search, facets: async () => (await load())[0].facets};
+})();
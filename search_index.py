@@ -0,0 +1,235 @@
+"""
+Pre-built client-side search index for the directory site.
+
+Tokenizes the body of every page and builds an inverted index with
+category, organization and type facets taken from the registry (falling
+back to a page's front matter categories). The index is written next to the
+rendered site as gzip-compressed JSON, sharded by term prefix, so the
+browser only downloads the shards for the words being typed:
+
+    _site/search-index/meta.json.gz      shard list, facets, document count
+    _site/search-index/docs.json.gz      titles, links and facet values
+    _site/search-index/terms-<xx>.json.gz  postings for terms starting with xx
+    _site/search-index/search-client.js  lazy loader and ranking for the browser
+
+`search.qmd` loads the client and renders the results with a category
+filter; pages with `search: false` in their front matter are not indexed.
+
+Usage:
+    python search_index.py                       # after rendering _site
+    python search_index.py --query "fuel moisture" --facet category="Fuel Moisture Models"
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import math
+import time
+import shutil
+import argparse
+from collections import Counter
+
+from front_matter import load_index, read_body
+from page_sets import load_registry
+
+SITE_DIR = "_site"
+INDEX_DIR = "search-index"
+CLIENT_SCRIPT = "search-client.js"
+
+PREFIX_LENGTH = 2
+FACETS = ("category", "organization", "type")
+
+# Title words count this many times a body occurrence
+TITLE_WEIGHT = 5
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+LINK_TARGET_PATTERN = re.compile(r"\]\([^)]*\)")
+
+STOPWORDS = frozenset("""
+a an and are as at be by can for from has have in into is it its of on or
+such that the their these this to was were which with will
+""".split())
+
+
+def tokenize(text):
+    """Return the index terms of a text, in order"""
+
+    text = LINK_TARGET_PATTERN.sub("]", text.lower())
+    return [token for token in TOKEN_PATTERN.findall(text) if len(token) > 1 and token not in STOPWORDS]
+
+
+def collect_documents():
+    """Return one document per page with its title, link and facet values"""
+
+    entries = {}
+    for set_entries in load_registry().values():
+        for entry in set_entries:
+            entries.setdefault(entry['filename'], entry)
+
+    documents = []
+    for page, front_matter in load_index().query().items():
+        # Pages left out of Quarto's own search (the search page itself)
+        if front_matter.get("search") is False:
+            continue
+        entry = entries.get(page, {})
+        categories = front_matter.get("categories") or []
+        documents.append({
+            "page": page,
+            "href": os.path.splitext(page)[0] + ".html",
+            "title": front_matter.get("title") or entry.get("title") or page,
+            "category": entry.get("category") or (categories[0] if categories else None),
+            "organization": entry.get("organization"),
+            "type": entry.get("type"),
+        })
+    return documents
+
+
+def build_index(documents):
+    """Return `{term: {doc id: weight}}` for a list of documents"""
+
+    postings = {}
+    for doc_id, document in enumerate(documents):
+        counts = Counter(tokenize(read_body(document["page"])))
+        for token in tokenize(document["title"]):
+            counts[token] += TITLE_WEIGHT
+        for term, count in counts.items():
+            postings.setdefault(term, {})[doc_id] = count
+    return postings
+
+
+def build_facets(documents):
+    """Return `{facet: {value: [doc ids]}}`"""
+
+    facets = {facet: {} for facet in FACETS}
+    for doc_id, document in enumerate(documents):
+        for facet in FACETS:
+            if document.get(facet):
+                facets[facet].setdefault(document[facet], []).append(doc_id)
+    return facets
+
+
+def shard_postings(postings, prefix_length=PREFIX_LENGTH):
+    """Group postings by term prefix; each posting list is `[[doc, weight], ...]`"""
+
+    shards = {}
+    for term in sorted(postings):
+        ranked = sorted(postings[term].items(), key=lambda posting: (-posting[1], posting[0]))
+        shards.setdefault(term[:prefix_length], {})[term] = [list(posting) for posting in ranked]
+    return shards
+
+
+def write_json_gz(path, data):
+    """Write compact JSON gzip-compressed at the highest level, reproducibly"""
+
+    raw = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(gzip.compress(raw, compresslevel=9, mtime=0))
+    return len(raw)
+
+
+def read_json_gz(path):
+    with open(path, "rb") as f:
+        return json.loads(gzip.decompress(f.read()))
+
+
+def write_index(out_dir, documents, shards, facets, prefix_length=PREFIX_LENGTH):
+    """Write the sharded index and the browser client into `out_dir`"""
+
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir)
+
+    docs = [[document[key] for key in ("title", "href") + FACETS] for document in documents]
+    write_json_gz(os.path.join(out_dir, "docs.json.gz"), docs)
+
+    for prefix, terms in shards.items():
+        write_json_gz(os.path.join(out_dir, f"terms-{prefix}.json.gz"), terms)
+
+    write_json_gz(os.path.join(out_dir, "meta.json.gz"), {
+        "documents": len(documents),
+        "prefix_length": prefix_length,
+        "shards": sorted(shards),
+        "facets": facets,
+        "fields": ["title", "href"] + list(FACETS),
+    })
+
+    shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), CLIENT_SCRIPT), out_dir)
+
+
+def search(out_dir, query, facets=None, limit=10):
+    """Query a written index the way the browser client does
+
+    Every query term must match a term starting with it; documents are
+    ranked by the sum of tf-idf weights and filtered by facet values.
+    """
+
+    meta = read_json_gz(os.path.join(out_dir, "meta.json.gz"))
+    docs = read_json_gz(os.path.join(out_dir, "docs.json.gz"))
+    prefix_length = meta["prefix_length"]
+    loaded = {}
+
+    scores = None
+    for token in tokenize(query):
+        prefix = token[:prefix_length]
+        if prefix not in meta["shards"]:
+            return []
+        if prefix not in loaded:
+            loaded[prefix] = read_json_gz(os.path.join(out_dir, f"terms-{prefix}.json.gz"))
+
+        matches = {}
+        for term, postings in loaded[prefix].items():
+            if term.startswith(token):
+                idf = math.log(1 + meta["documents"] / len(postings))
+                for doc_id, weight in postings:
+                    matches[doc_id] = matches.get(doc_id, 0) + weight * idf
+        scores = matches if scores is None else {doc: scores[doc] + matches[doc] for doc in scores if doc in matches}
+
+    if not scores:
+        return []
+
+    for facet, value in (facets or {}).items():
+        allowed = set(meta["facets"].get(facet, {}).get(value, []))
+        scores = {doc: score for doc, score in scores.items() if doc in allowed}
+
+    ranked = sorted(scores, key=lambda doc: (-scores[doc], doc))[:limit]
+    return [dict(zip(meta["fields"], docs[doc]), score=round(scores[doc], 3)) for doc in ranked]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the sharded client-side search index")
+    parser.add_argument("--site-dir", default=SITE_DIR, help=f"rendered site directory (default: {SITE_DIR})")
+    parser.add_argument("--prefix-length", type=int, default=PREFIX_LENGTH,
+                        help=f"term prefix length per shard (default: {PREFIX_LENGTH})")
+    parser.add_argument("--query", help="search the existing index instead of building it")
+    parser.add_argument("--facet", action="append", default=[], metavar="NAME=VALUE",
+                        help="with --query, only return documents with this facet value")
+    args = parser.parse_args(argv)
+
+    out_dir = os.path.join(args.site_dir, INDEX_DIR)
+
+    if args.query:
+        facets = dict(facet.split("=", 1) for facet in args.facet)
+        start = time.perf_counter()
+        results = search(out_dir, args.query, facets)
+        elapsed = (time.perf_counter() - start) * 1000
+        for result in results:
+            print(f"{result['score']:>8}  {result['title']} ({result['href']})")
+        print(f"🔎 {len(results)} results in {elapsed:.1f} ms")
+        return 0
+
+    start = time.perf_counter()
+    documents = collect_documents()
+    postings = build_index(documents)
+    shards = shard_postings(postings, args.prefix_length)
+    write_index(out_dir, documents, shards, build_facets(documents), args.prefix_length)
+
+    size = sum(os.path.getsize(os.path.join(out_dir, name)) for name in os.listdir(out_dir))
+    print(f"🔎 Indexed {len(documents)} pages, {len(postings)} terms in {len(shards)} shards "
+          f"({size / 1024:.0f} KB compressed) in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())